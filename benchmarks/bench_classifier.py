@@ -0,0 +1,165 @@
+"""Benchmark the compiled keyword classifier against the per-keyword scans it replaced.
+
+Also sweeps synthetic keyword tables across KeywordClassifier.regex_threshold, timing
+the substring-scan and trie-regex paths on the same inputs, to check where one starts
+beating the other. Every shipped table is below the threshold, so this sweep is the
+only place the regex path runs.
+
+Run from the repository root:
+    python benchmarks/bench_classifier.py
+"""
+import random
+import string
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / 'task-1'))
+
+from keyword_classifier import (
+    KeywordClassifier, COMPANY_CLASSIFIER, EDUCATION_CLASSIFIER, INDUSTRY_CLASSIFIER, INDUSTRY_KEYWORDS,
+    PROFILE_CLASSIFIER, TECH_CLASSIFIER, TECH_KEYWORDS, TITLE_CLASSIFIER
+)
+
+
+# Previous implementations, kept here as the baseline
+def legacy_tech_stack(description_text):
+    found_techs = []
+    for tech in TECH_KEYWORDS:
+        if tech.lower() in description_text.lower():
+            found_techs.append(tech)
+    return ', '.join(found_techs) if found_techs else ''
+
+
+def legacy_industries(description_text):
+    industries = []
+    for industry, keywords in INDUSTRY_KEYWORDS.items():
+        if any(keyword in description_text.lower() for keyword in keywords):
+            industries.append(industry)
+    return industries
+
+
+def legacy_title_signals(title, company):
+    title = title.lower()
+    company = company.lower()
+    return (
+        'founding' in title, 'staff' in title, 'senior' in title, 'software engineer' in title,
+        any(x in title for x in ['ai', 'ml', 'machine learning']),
+        'full stack' in title or 'fullstack' in title,
+        any(kw in title for kw in ['founding', 'founder', 'early']),
+        any(co in company for co in ['waymo', 'scale', 'glean', 'openai', 'anthropic']),
+        any(ind in f"{title} {company}" for ind in ['founding', 'founder', 'early', 'seed', 'series a']),
+        any(co in company for co in ['google', 'meta', 'amazon', 'microsoft', 'apple']),
+    )
+
+
+def classifier_title_signals(title, company):
+    title_labels = TITLE_CLASSIFIER.classify(title)
+    company_labels = COMPANY_CLASSIFIER.classify(company)
+    profile_labels = PROFILE_CLASSIFIER.classify(f"{title} {company}")
+    return (
+        'founding' in title_labels, 'staff' in title_labels, 'senior' in title_labels,
+        'software engineer' in title_labels, 'ai/ml' in title_labels, 'full stack' in title_labels,
+        'startup title' in title_labels, 'ai company' in company_labels,
+        'startup' in profile_labels, 'big tech' in company_labels,
+    )
+
+
+def legacy_education(education):
+    education = str(education).lower()
+    if any(s in education for s in ['stanford', 'mit', 'berkeley', 'carnegie mellon', 'princeton', 'harvard', 'yale']):
+        return 'top school'
+    if any(s in education for s in ['cornell', 'columbia', 'ucla', 'ucsd', 'university of michigan', 'georgia tech', 'caltech']):
+        return 'good school'
+    return None
+
+
+def classifier_education(education):
+    labels = EDUCATION_CLASSIFIER.classify(str(education))
+    return 'top school' if 'top school' in labels else 'good school' if 'good school' in labels else None
+
+
+def synthetic_inputs(count, seed=0):
+    rng = random.Random(seed)
+    words = [
+        'python', 'react', 'javascript', 'golang', 'platform', 'AI', 'data', 'payments', 'saas',
+        'developer', 'tools', 'remote', 'engineer', 'founding', 'senior', 'staff', 'series A',
+        'Stanford', 'MIT', 'Cornell', 'Google', 'OpenAI', 'full stack', 'machine learning', 'lead'
+    ]
+    cards = [' '.join(rng.choice(words) for _ in range(rng.randint(10, 40))) for _ in range(count)]
+    titles = [' '.join(rng.choice(words) for _ in range(rng.randint(2, 5))) for _ in range(count)]
+    companies = [rng.choice(words) + ' Inc' for _ in range(count)]
+    return cards, titles, companies
+
+
+def compare(name, legacy, compiled, inputs, repeat=5):
+    mismatches = sum(legacy(*args) != compiled(*args) for args in inputs)
+    legacy_time = min(timeit.repeat(lambda: [legacy(*args) for args in inputs], number=1, repeat=repeat))
+    compiled_time = min(timeit.repeat(lambda: [compiled(*args) for args in inputs], number=1, repeat=repeat))
+    per_item = 1e6 / len(inputs)
+    print(f"{name:<22} legacy {legacy_time * per_item:8.2f} us  compiled {compiled_time * per_item:8.2f} us  "
+          f"speedup {legacy_time / compiled_time:5.2f}x  mismatches {mismatches}")
+    return mismatches
+
+
+# Same tables, each path forced regardless of size
+ScanClassifier = type('ScanClassifier', (KeywordClassifier,), {'regex_threshold': float('inf')})
+TrieClassifier = type('TrieClassifier', (KeywordClassifier,), {'regex_threshold': -1})
+TABLE_SIZES = [32, 64, 128, 192, 256, 512, 1024, 2048]
+
+
+def synthetic_tables(count, seed=0):
+    """Texts and a word pool for keyword tables; a fifth of the keywords extend another
+    keyword ('java' / 'javascript') so overlapping matches are exercised"""
+    rng = random.Random(seed)
+
+    def word():
+        return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+
+    pool = []
+    for _ in range(max(TABLE_SIZES)):
+        pool.append(pool[-1] + word()[:3] if pool and rng.random() < 0.2 else word())
+    texts = [' '.join(rng.choice(pool) if rng.random() < 0.3 else word() for _ in range(rng.randint(40, 120)))
+             for _ in range(count)]
+    return pool, texts
+
+
+def sweep_regex_threshold(repeat=3):
+    """Time both classification paths per table size; returns the number of disagreeing outputs"""
+    pool, texts = synthetic_tables(500)
+    print(f"\nkeyword table sweep (regex_threshold = {KeywordClassifier.regex_threshold})")
+    mismatches = 0
+    for size in TABLE_SIZES:
+        # Several keywords per label, as in the shipped tables
+        labels = {f"label {i}": pool[i:size:max(1, size // 4)] for i in range(max(1, size // 4))}
+        scan, trie = ScanClassifier(labels), TrieClassifier(labels)
+        mismatches += sum(scan.classify(text) != trie.classify(text) for text in texts)
+        scan_time = min(timeit.repeat(lambda: [scan.classify(text) for text in texts], number=1, repeat=repeat))
+        trie_time = min(timeit.repeat(lambda: [trie.classify(text) for text in texts], number=1, repeat=repeat))
+        per_item = 1e6 / len(texts)
+        chosen = 'regex' if size > KeywordClassifier.regex_threshold else 'scan'
+        print(f"{size:>5} keywords  scan {scan_time * per_item:8.2f} us  regex {trie_time * per_item:8.2f} us  "
+              f"faster {'regex' if trie_time < scan_time else 'scan':<5}  used {chosen}")
+    return mismatches
+
+
+def main():
+    cards, titles, companies = synthetic_inputs(5000)
+    mismatches = 0
+    mismatches += compare('tech stack', legacy_tech_stack,
+                          lambda text: ', '.join(TECH_CLASSIFIER.classify_ordered(text)),
+                          [(card,) for card in cards])
+    mismatches += compare('industry', legacy_industries, INDUSTRY_CLASSIFIER.classify_ordered,
+                          [(card,) for card in cards])
+    mismatches += compare('title/company signals', legacy_title_signals, classifier_title_signals,
+                          list(zip(titles, companies)))
+    mismatches += compare('education', legacy_education, classifier_education,
+                          [(title,) for title in titles])
+    mismatches += sweep_regex_threshold()
+    if mismatches:
+        sys.exit(f"{mismatches} outputs differ from the legacy implementations")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""End-to-end benchmark of the resume matcher and candidate ranker on synthetic data.
+
+Generates jobs, resume PDFs and a Juicebox export (see synthetic_data.py), times every
+stage, and reports latency percentiles and throughput. With --baseline the results are
+compared against a saved run and the script fails if any stage's median latency grew
+by more than --threshold, or if the baseline is missing or was recorded with other
+options; --update-baseline writes the current run as the new baseline.
+
+Run from the repository root:
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json [--update-baseline]
+
+Baselines are machine specific: record one on the machine that checks against it.
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / 'task-1'))
+sys.path.append(str(ROOT / 'task-2'))
+
+from synthetic_data import write_dataset
+
+from candidate_matcher import load_candidates, rank_candidates, rank_candidates_vectorized
+from resume_matcher import ResumeJobMatcher
+
+STAGES = ['load_jobs', 'embed_jobs', 'extract_text_from_pdf', 'load_resumes', 'embed_resumes',
+          'find_top_matches', 'match_all_resumes', 'match_all_resumes_batched', 'load_candidates',
+          'rank_candidates', 'rank_candidates_vectorized']
+
+
+def time_calls(fn, repeat, warmup=1):
+    """Seconds taken by each of `repeat` calls of fn, after `warmup` untimed calls"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples, items_per_call):
+    samples_ms = np.asarray(samples) * 1000
+    p50 = float(np.percentile(samples_ms, 50))
+    return {
+        'samples': len(samples),
+        'items_per_call': items_per_call,
+        'p50_ms': p50,
+        'p95_ms': float(np.percentile(samples_ms, 95)),
+        'mean_ms': float(samples_ms.mean()),
+        'throughput_per_s': items_per_call / (p50 / 1000) if p50 else float('inf'),
+    }
+
+
+def new_matcher(model, resume_dir):
+    """A matcher with no on-disk caches, sharing an already loaded model"""
+    matcher = ResumeJobMatcher(cache_dir=None, text_cache_path=None, catalog_path=None)
+    matcher._model = model
+    matcher.resume_dir = Path(resume_dir)
+    return matcher
+
+
+def run_suite(paths, repeat, stages, workers=1, n=2):
+    """{stage: summary} for the selected stages"""
+    model = ResumeJobMatcher(cache_dir=None, text_cache_path=None, catalog_path=None).model
+    matcher = new_matcher(model, paths['resume_dir'])
+    matcher.load_jobs(paths['paraform_csv'], paths['srn_jobs'])
+    matcher.load_resumes(workers=workers)
+    resume_texts = list(matcher.resumes.values())
+    job_texts = matcher.jobs_df['combined_text'].tolist()
+    pdf_paths = sorted(Path(paths['resume_dir']).glob('*.pdf'))
+    candidates = load_candidates(paths['candidates_csv'])
+
+    def load_jobs():
+        new_matcher(model, paths['resume_dir']).load_jobs(paths['paraform_csv'], paths['srn_jobs'])
+
+    def load_resumes():
+        new_matcher(model, paths['resume_dir']).load_resumes(workers=workers)
+
+    # stage: (function timed per call, items it processes)
+    benchmarks = {
+        'load_jobs': (load_jobs, len(job_texts)),
+        'embed_jobs': (lambda: matcher.encode_jobs(job_texts), len(job_texts)),
+        'load_resumes': (load_resumes, len(pdf_paths)),
+        'embed_resumes': (lambda: matcher.encode_resumes(resume_texts), len(resume_texts)),
+        'match_all_resumes': (lambda: matcher.match_all_resumes(n=n), len(resume_texts)),
+        'match_all_resumes_batched': (lambda: matcher.match_all_resumes(n=n, batched=True), len(resume_texts)),
+        'load_candidates': (lambda: load_candidates(paths['candidates_csv']), len(candidates)),
+        'rank_candidates': (lambda: rank_candidates(candidates), len(candidates)),
+        'rank_candidates_vectorized': (lambda: rank_candidates_vectorized(candidates, top_k=10), len(candidates)),
+    }
+    # Per-item stages: one sample per PDF or resume on each repeat
+    per_item = {
+        'extract_text_from_pdf': (matcher.extract_text_from_pdf, pdf_paths),
+        'find_top_matches': (lambda text: matcher.find_top_matches(text, n=n), resume_texts),
+    }
+
+    results = {}
+    for stage in stages:
+        if stage in per_item:
+            fn, items = per_item[stage]
+            fn(items[0])
+            samples = [seconds for _ in range(repeat) for item in items
+                       for seconds in time_calls(lambda: fn(item), 1, warmup=0)]
+            results[stage] = summarize(samples, 1)
+        else:
+            fn, items = benchmarks[stage]
+            results[stage] = summarize(time_calls(fn, repeat), items)
+        stats = results[stage]
+        print(f"{stage:<28} p50 {stats['p50_ms']:10.2f} ms  p95 {stats['p95_ms']:10.2f} ms  "
+              f"{stats['throughput_per_s']:12,.1f} items/s")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Regression messages for stages whose median latency grew by more than threshold"""
+    regressions = []
+    for stage, stats in results.items():
+        previous = baseline['stages'].get(stage)
+        if previous is None:
+            continue
+        change = stats['p50_ms'] / previous['p50_ms'] - 1 if previous['p50_ms'] else 0.0
+        print(f"{stage:<28} {previous['p50_ms']:10.2f} ms -> {stats['p50_ms']:10.2f} ms ({change:+.0%})")
+        if change > threshold:
+            regressions.append(f"{stage} p50 regressed {change:+.0%} "
+                               f"({previous['p50_ms']:.2f} ms -> {stats['p50_ms']:.2f} ms)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=2000, help='Synthetic jobs, split between Paraform and SRN')
+    parser.add_argument('--resumes', type=int, default=50, help='Synthetic resume PDFs')
+    parser.add_argument('--candidates', type=int, default=5000, help='Synthetic Juicebox candidates')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help='Keep the synthetic data here instead of a temporary directory')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions per stage')
+    parser.add_argument('--workers', type=int, default=1, help='PDF extraction processes for load_resumes')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--output', help='Write the results as JSON')
+    parser.add_argument('--baseline', help='Baseline JSON to compare against')
+    parser.add_argument('--update-baseline', action='store_true', help='Save this run as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed growth in median latency before a stage counts as regressed')
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    config = {key: getattr(args, key) for key in ('jobs', 'resumes', 'candidates', 'seed', 'repeat', 'workers')}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = write_dataset(args.data_dir or tmp_dir, args.jobs, args.resumes, args.candidates, args.seed)
+        stages = run_suite(paths, args.repeat, args.stages, workers=args.workers)
+
+    report = {
+        'config': config,
+        'machine': {'python': platform.python_version(), 'platform': platform.platform()},
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'stages': stages,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    regressions = []
+    baseline_path = Path(args.baseline) if args.baseline else None
+    if baseline_path and args.update_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {baseline_path}")
+    elif baseline_path:
+        # A check that silently passes for want of a baseline is worse than none
+        if not baseline_path.exists():
+            sys.exit(f"Baseline {baseline_path} does not exist; record one on this machine with --update-baseline")
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['config'] != config:
+            sys.exit(f"Baseline {baseline_path} was recorded with {baseline['config']}, this run used {config}; "
+                     f"rerun with the same options or --update-baseline")
+        regressions = compare(stages, baseline, args.threshold)
+
+    if regressions:
+        sys.exit('\n'.join(regressions))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Startup-time check for the resume and candidate matcher entry points.
+
+Each entry point is imported in a fresh interpreter under `python -X importtime`.
+The script prints the slowest imports, fails if a heavy dependency (pandas, torch,
+sentence-transformers, ...) is imported before it is used, and optionally fails
+when importing takes longer than a budget.
+
+Run from the repository root:
+    python benchmarks/bench_startup.py [--max-import-ms 400] [--output startup.json]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Only imported once a feature actually needs them
+HEAVY_MODULES = ['pandas', 'torch', 'sentence_transformers', 'sklearn', 'scipy', 'pdfplumber', 'transformers',
+                 'http.server']
+
+ENTRY_POINTS = {
+    'resume_matcher': ROOT / 'task-1',
+    'candidate_matcher': ROOT / 'task-2',
+}
+
+# Constructing the matcher must not load the model either
+CONSTRUCT_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from resume_matcher import ResumeJobMatcher
+matcher = ResumeJobMatcher(cache_dir=None, text_cache_path=None, catalog_path=None)
+print(json.dumps({{
+    'construct_ms': (time.perf_counter() - start) * 1000,
+    'heavy_modules_loaded': [m for m in {heavy!r} if m in sys.modules]
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def run_python(args, cwd):
+    result = subprocess.run([sys.executable, *args], cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(f"Command failed in {cwd}:\n{result.stderr}")
+    return result
+
+
+def measure_import(module, cwd):
+    code = f"import sys; import {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    start = time.perf_counter()
+    result = run_python(['-X', 'importtime', '-c', code], cwd)
+    wall_ms = (time.perf_counter() - start) * 1000
+    rows = parse_importtime(result.stderr)
+    entry = next(row for row in rows if row[0] == module)
+    top_level = sorted((row for row in rows if row[3] == 1), key=lambda row: -row[2])
+    return {
+        'module': module,
+        'import_ms': entry[2] / 1000,
+        'interpreter_wall_ms': wall_ms,
+        'heavy_modules_loaded': [m for m in result.stdout.strip().split(',') if m],
+        'slowest_imports': [{'module': name, 'cumulative_ms': cumulative / 1000}
+                            for name, _, cumulative, _ in top_level[:8]],
+    }
+
+
+def measure_construct():
+    result = run_python(['-c', CONSTRUCT_SNIPPET.format(heavy=HEAVY_MODULES)], ENTRY_POINTS['resume_matcher'])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-import-ms', type=float, default=None,
+                        help='Fail if importing an entry point takes longer than this')
+    parser.add_argument('--output', help='Write the measurements as JSON')
+    args = parser.parse_args()
+
+    failures = []
+    report = {'imports': [], 'matcher_construction': None}
+    for module, cwd in ENTRY_POINTS.items():
+        stats = measure_import(module, cwd)
+        report['imports'].append(stats)
+        print(f"{module}: import {stats['import_ms']:.0f} ms (interpreter total {stats['interpreter_wall_ms']:.0f} ms)")
+        for item in stats['slowest_imports']:
+            print(f"    {item['module']:<28} {item['cumulative_ms']:8.1f} ms")
+        if stats['heavy_modules_loaded']:
+            failures.append(f"{module} imports {', '.join(stats['heavy_modules_loaded'])} at startup")
+        if args.max_import_ms is not None and stats['import_ms'] > args.max_import_ms:
+            failures.append(f"{module} import took {stats['import_ms']:.0f} ms (budget {args.max_import_ms:.0f} ms)")
+
+    construct = measure_construct()
+    report['matcher_construction'] = construct
+    print(f"ResumeJobMatcher(): {construct['construct_ms']:.0f} ms including import")
+    if construct['heavy_modules_loaded']:
+        failures.append(f"ResumeJobMatcher() loads {', '.join(construct['heavy_modules_loaded'])}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Check that every job index kind searches the same after a save/load round trip.
+
+Builds each index through ResumeJobMatcher.build_index with an index path, then builds
+again so the saved index is reloaded with the same CLI params, and compares the
+reloaded search, with and without a filter mask, against the in-memory one.
+
+Run from the repository root:
+    python benchmarks/check_vector_index.py
+"""
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / 'task-1'))
+
+from resume_matcher import ResumeJobMatcher
+
+# kind: index params as run() passes them for that kind
+CASES = {
+    'exact': {'max_memory_mb': 256},
+    'ivf': {'nprobe': 8, 'n_lists': None},
+    'float16': {'max_memory_mb': 256},
+    'int8': {'max_memory_mb': 256},
+}
+
+
+def build_index(kind, params, vectors, path):
+    matcher = ResumeJobMatcher(cache_dir=None, text_cache_path=None, catalog_path=None,
+                               index_kind=kind, index_params=dict(params), index_path=path)
+    matcher.jobs_df = pd.DataFrame({'combined_text': [f"job {i}" for i in range(len(vectors))]})
+    matcher.job_embeddings = vectors
+    matcher.build_index()
+    return matcher.index
+
+
+def check(kind, params, vectors, queries, masks, k, tmp_dir):
+    # No extension, as in --index-path job_index: every kind must save and reload it verbatim
+    path = Path(tmp_dir) / f"{kind}_index"
+    built = build_index(kind, params, vectors, path)
+    if not path.exists():
+        return [f"{kind}: index was not saved to {path.name}"]
+    saved_at = path.stat().st_mtime_ns
+    loaded = build_index(kind, params, vectors, path)
+
+    failures = []
+    if path.stat().st_mtime_ns != saved_at:
+        failures.append(f"{kind}: saved index was rebuilt instead of reloaded")
+    for name, mask in masks.items():
+        expected = built.search(queries, k, mask=mask)
+        try:
+            actual = loaded.search(queries, k, mask=mask)
+        except Exception as e:
+            failures.append(f"{kind}: {name} search failed after reload: {e!r}")
+            continue
+        if not (np.array_equal(expected[1], actual[1]) and np.allclose(expected[0], actual[0])):
+            failures.append(f"{kind}: {name} search differs after reload")
+    return failures
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((5000, 64)).astype(np.float32)
+    queries = rng.standard_normal((50, 64)).astype(np.float32)
+    masks = {
+        'unfiltered': None,
+        'masked': rng.random(len(vectors)) < 0.5,
+        'selective mask': rng.random(len(vectors)) < 0.01,
+    }
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for kind, params in CASES.items():
+            kind_failures = check(kind, params, vectors, queries, masks, 10, tmp_dir)
+            print(f"{kind:<8} {'FAIL' if kind_failures else 'ok'}")
+            failures += kind_failures
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
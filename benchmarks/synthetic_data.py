@@ -0,0 +1,175 @@
+"""Synthetic inputs for the benchmarks, shaped like the real data in task-1 and task-2.
+
+    jobs:        a Paraform-style CSV and an SRN JSONL snapshot
+    resumes:     one-page text PDFs (written directly, no PDF library needed)
+    candidates:  a Juicebox export CSV
+
+Run from the repository root to write a data set to disk:
+    python benchmarks/synthetic_data.py --out bench_data --jobs 2000 --resumes 50 --candidates 20000
+"""
+import argparse
+import csv
+import json
+import random
+from pathlib import Path
+
+TECH = ['Python', 'TypeScript', 'React', 'Node.js', 'Go', 'Java', 'Rust', 'AWS', 'GCP', 'Kubernetes',
+        'Docker', 'PostgreSQL', 'Kafka', 'GraphQL', 'Next.js', 'PyTorch', 'TensorFlow', 'Redis', 'Terraform']
+ROLES = ['Software Engineer', 'Senior Backend Engineer', 'Founding Engineer', 'Full Stack Engineer',
+         'Machine Learning Engineer', 'Staff Software Engineer', 'Frontend Engineer', 'Platform Engineer']
+LOCATIONS = ['New York', 'San Francisco', 'Bay Area', 'Remote', 'Seattle', 'Austin', 'Boston']
+WORKPLACES = ['On-site', 'Hybrid', 'Remote']
+INDUSTRIES = ['AI', 'Fintech', 'Healthcare', 'Developer Tools', 'Data', 'Security', 'Tech']
+WORDS = ['build', 'scale', 'ship', 'design', 'systems', 'product', 'customers', 'data', 'platform',
+         'reliable', 'distributed', 'teams', 'infrastructure', 'models', 'services', 'latency', 'growth']
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn']
+LAST_NAMES = ['Smith', 'Chen', 'Patel', 'Garcia', 'Kim', 'Nguyen', 'Cohen', 'Okafor', 'Silva', 'Berg']
+COMPANIES = ['Stripe', 'Vanta', 'Ramp', 'Google', 'Meta', 'Acme Labs', 'Stealth Startup', 'Datadog', 'Plaid']
+SCHOOLS = ['MIT', 'Stanford University', 'Cornell University', 'University of Waterloo',
+           'State University', 'Carnegie Mellon University']
+CITIES = ['Brooklyn New York United States', 'San Francisco California United States',
+          'Toronto Ontario Canada', 'Austin Texas United States', 'New York New York United States']
+
+PARAFORM_COLUMNS = ['Link', 'Company', 'Role', 'One liner', 'Reward', 'Locations', 'Tech Stack', 'Workplace',
+                    'Salary', 'Equity', 'Visa', 'YOE', 'Team Size', 'Funding', 'Website', 'Requirements',
+                    'Industry']
+JUICEBOX_COLUMNS = ['First name', 'Last name', 'Location', 'LinkedIn', 'Personal Email',
+                    'Personal Email Verification', 'Work Email', 'Work Email Verification', 'Phone Numbers',
+                    'GitHub', 'Current Title', 'Current Org Name', 'Education']
+
+
+def sentence(rng, n_words):
+    return ' '.join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + '.'
+
+
+def synthetic_job(rng, i):
+    """(Paraform CSV row, SRN JSONL record) for job i"""
+    company = f"{rng.choice(COMPANIES)} {i}"
+    role = rng.choice(ROLES)
+    stack = ', '.join(sorted(rng.sample(TECH, rng.randint(2, 6))))
+    low = rng.randrange(100, 220, 10)
+    years = rng.randint(1, 8)
+    requirements = f"{years}+ years of experience with {stack}. " + ' '.join(
+        sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(1, 4)))
+    row = {
+        'Link': f"https://paraform.com/company/{i}", 'Company': company, 'Role': role,
+        'One liner': sentence(rng, 6), 'Reward': '10% first year',
+        'Locations': ', '.join(rng.sample(LOCATIONS, rng.randint(1, 2))), 'Tech Stack': stack,
+        'Workplace': rng.choice(WORKPLACES), 'Salary': f"${low}k - ${low + rng.randrange(20, 80, 10)}k",
+        'Equity': f"{rng.randint(1, 9) / 10}%", 'Visa': rng.choice(['Available', 'Not available']),
+        'YOE': f"{years}+ years", 'Team Size': rng.randint(2, 200), 'Funding': f"${rng.randint(2, 90)}M",
+        'Website': f"https://example{i}.com", 'Requirements': requirements,
+        'Industry': ', '.join(rng.sample(INDUSTRIES, rng.randint(1, 2))),
+    }
+    record = {
+        'source': 'SRN', 'timestamp': '2025-04-12 01:28:32', 'Company': company, 'Role': role,
+        'Locations': row['Locations'], 'Salary': f"${low},000 - ${low + 40},000", 'Workplace': row['Workplace'],
+        'Tech Stack': stack, 'YOE': f"{years}+ years", 'Industry': row['Industry'],
+        'Equity': 'Not specified', 'Visa': 'Contact company', 'Team Size': 'Not specified',
+        'Funding': 'Not specified', 'Requirements': 'See job description', 'One liner': '',
+    }
+    return row, record
+
+
+def resume_lines(rng):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [name, f"{rng.choice(ROLES)} | {rng.choice(LOCATIONS)}", '', 'EXPERIENCE']
+    for _ in range(rng.randint(2, 4)):
+        lines.append(f"{rng.choice(ROLES)}, {rng.choice(COMPANIES)} ({rng.randint(2012, 2020)} - Present)")
+        lines.extend(f"- {sentence(rng, rng.randint(8, 14))}" for _ in range(rng.randint(2, 4)))
+    lines += ['', 'SKILLS', ', '.join(rng.sample(TECH, rng.randint(4, 10))), '', 'EDUCATION',
+              f"B.S. Computer Science, {rng.choice(SCHOOLS)}"]
+    return lines
+
+
+def _pdf_string(text):
+    return '(' + text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+
+def minimal_pdf(lines):
+    """Bytes of a one-page PDF showing lines in Helvetica"""
+    content = '\n'.join(['BT', '/F1 10 Tf', '12 TL', '50 760 Td'] +
+                        [f"{_pdf_string(line)} Tj T*" for line in lines] + ['ET']).encode('latin-1', 'replace')
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R '
+        b'/Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length ' + str(len(content)).encode() + b' >>\nstream\n' + content + b'\nendstream',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b'\nendobj\n'
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b''.join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def synthetic_candidate(rng, i):
+    first, last = rng.choice(FIRST_NAMES), f"{rng.choice(LAST_NAMES)}{i}"
+    handle = f"{first}{last}".lower()
+    return {
+        'First name': first, 'Last name': last, 'Location': rng.choice(CITIES),
+        'LinkedIn': f"https://linkedin.com/in/{handle}", 'Personal Email': f"{handle}@gmail.com",
+        'Personal Email Verification': 'Deliverable', 'Work Email': '', 'Work Email Verification': '',
+        'Phone Numbers': '', 'GitHub': f"https://github.com/{handle}" if rng.random() < 0.4 else '',
+        'Current Title': rng.choice(ROLES), 'Current Org Name': rng.choice(COMPANIES),
+        'Education': ', '.join(rng.sample(SCHOOLS, rng.randint(1, 2))),
+    }
+
+
+def write_dataset(out_dir, jobs=2000, resumes=50, candidates=20000, seed=0):
+    """Write every synthetic input under out_dir and return their paths"""
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    resume_dir = out_dir / 'resumes'
+    resume_dir.mkdir(parents=True, exist_ok=True)
+    paths = {
+        'paraform_csv': out_dir / 'paraform_jobs.csv',
+        'srn_jobs': out_dir / 'srn_jobs.jsonl',
+        'resume_dir': resume_dir,
+        'candidates_csv': out_dir / 'juicebox_candidates.csv',
+    }
+
+    # Split jobs evenly between the two sources
+    with open(paths['paraform_csv'], 'w', newline='', encoding='utf-8') as csv_file, \
+            open(paths['srn_jobs'], 'w', encoding='utf-8') as jsonl_file:
+        writer = csv.DictWriter(csv_file, fieldnames=PARAFORM_COLUMNS)
+        writer.writeheader()
+        for i in range(jobs):
+            row, record = synthetic_job(rng, i)
+            if i % 2:
+                jsonl_file.write(json.dumps(record) + '\n')
+            else:
+                writer.writerow(row)
+
+    for i in range(resumes):
+        (resume_dir / f"resume_{i:04d}.pdf").write_bytes(minimal_pdf(resume_lines(rng)))
+
+    with open(paths['candidates_csv'], 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=JUICEBOX_COLUMNS, quoting=csv.QUOTE_ALL)
+        writer.writeheader()
+        writer.writerows(synthetic_candidate(rng, i) for i in range(candidates))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default='bench_data', help='Directory to write the data set to')
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--resumes', type=int, default=50)
+    parser.add_argument('--candidates', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    paths = write_dataset(args.out, args.jobs, args.resumes, args.candidates, args.seed)
+    for name, path in paths.items():
+        print(f"{name}: {path}")
+
+
+if __name__ == '__main__':
+    main()
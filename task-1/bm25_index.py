@@ -0,0 +1,167 @@
+import re
+from collections import Counter
+
+import numpy as np
+
+# Keeps technology names whole: c++, c#, node.js, next.js
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+# 'nan' is how combined_text renders a missing field
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or our that the their this to was we '
+    'will with you your nan'.split()
+)
+FUSION_METHODS = ('rerank', 'linear', 'rrf')
+
+
+def tokenize(text):
+    if not isinstance(text, str):
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 inverted index with postings kept as compact numpy arrays.
+
+    Each term has an int32 array of the documents containing it and a uint16 array
+    of its count in each. add() appends documents (ids continue from the current
+    size) and remove() retires them without renumbering; new postings are buffered
+    and merged into the arrays on the next search.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.terms = {}         # term -> term id
+        self.doc_ids = []       # term id -> int32 array of documents containing the term
+        self.term_freqs = []    # term id -> uint16 array of the term's count in each of them
+        self._pending = {}      # term id -> [(doc ids, counts)] added since the last merge
+        self.doc_lengths = np.empty(0, dtype=np.float32)
+        self.live = np.empty(0, dtype=bool)
+        self.live_count = 0
+        self.live_length = 0.0
+
+    def __len__(self):
+        return self.live_count
+
+    def add(self, texts):
+        """Index texts as new documents; returns their ids"""
+        start = len(self.doc_lengths)
+        term_ids, docs, freqs, lengths = [], [], [], []
+        for doc, text in enumerate(texts, start):
+            counts = Counter(tokenize(text))
+            term_ids.extend(self.terms.setdefault(term, len(self.terms)) for term in counts)
+            freqs.extend(counts.values())
+            docs.extend([doc] * len(counts))
+            lengths.append(sum(counts.values()))
+        for _ in range(len(self.doc_ids), len(self.terms)):
+            self.doc_ids.append(np.empty(0, dtype=np.int32))
+            self.term_freqs.append(np.empty(0, dtype=np.uint16))
+
+        # Group the new postings by term with one stable sort, keeping documents in id order
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids, kind='stable')
+        term_ids = term_ids[order]
+        docs = np.asarray(docs, dtype=np.int32)[order]
+        freqs = np.minimum(np.asarray(freqs, dtype=np.int64)[order], 65535).astype(np.uint16)
+        bounds = np.flatnonzero(np.diff(term_ids)) + 1
+        for term_id, term_docs, term_freqs in zip(term_ids[np.r_[0, bounds]] if len(term_ids) else [],
+                                                  np.split(docs, bounds), np.split(freqs, bounds)):
+            self._pending.setdefault(int(term_id), []).append((term_docs, term_freqs))
+
+        self.doc_lengths = np.concatenate([self.doc_lengths, np.asarray(lengths, dtype=np.float32)])
+        self.live = np.concatenate([self.live, np.ones(len(lengths), dtype=bool)])
+        self.live_count += len(lengths)
+        self.live_length += sum(lengths)
+        return np.arange(start, start + len(lengths))
+
+    def remove(self, doc_ids):
+        """Stop returning these documents; their postings are dropped by compact()"""
+        doc_ids = np.unique(np.asarray(doc_ids, dtype=np.int64))
+        doc_ids = doc_ids[self.live[doc_ids]]
+        self.live[doc_ids] = False
+        self.live_count -= len(doc_ids)
+        self.live_length -= float(self.doc_lengths[doc_ids].sum())
+
+    def _merge_pending(self):
+        for term_id, batches in self._pending.items():
+            self.doc_ids[term_id] = np.concatenate([self.doc_ids[term_id]] + [docs for docs, _ in batches])
+            self.term_freqs[term_id] = np.concatenate([self.term_freqs[term_id]] + [freqs for _, freqs in batches])
+        self._pending = {}
+
+    def compact(self):
+        """Drop the postings of removed documents"""
+        self._merge_pending()
+        for term_id, docs in enumerate(self.doc_ids):
+            keep = self.live[docs]
+            if not keep.all():
+                self.doc_ids[term_id] = docs[keep]
+                self.term_freqs[term_id] = self.term_freqs[term_id][keep]
+
+    def search(self, query, k, mask=None, max_query_terms=None):
+        """(scores, doc ids) of the k best-scoring documents for query text, best first.
+
+        Only documents sharing a term with the query are returned. mask, a boolean
+        array over doc ids, restricts the results; max_query_terms keeps only the
+        query's rarest terms, which bounds the work for long queries such as resumes.
+        """
+        self._merge_pending()
+        empty = np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        term_ids = sorted({self.terms[term] for term in tokenize(query) if term in self.terms})
+        if not term_ids or k <= 0 or not self.live_count:
+            return empty
+
+        doc_freqs = np.array([len(self.doc_ids[term_id]) for term_id in term_ids])
+        idf = np.log1p((self.live_count - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        if max_query_terms and len(term_ids) > max_query_terms:
+            rarest = np.argsort(-idf, kind='stable')[:max_query_terms]
+            term_ids = [term_ids[i] for i in rarest]
+            doc_freqs, idf = doc_freqs[rarest], idf[rarest]
+
+        docs = np.concatenate([self.doc_ids[term_id] for term_id in term_ids])
+        freqs = np.concatenate([self.term_freqs[term_id] for term_id in term_ids]).astype(np.float32)
+        average_length = self.live_length / self.live_count or 1.0
+        norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[docs] / average_length)
+        weights = np.repeat(idf, doc_freqs) * freqs * (self.k1 + 1) / (freqs + norm)
+        scores = np.bincount(docs, weights=weights, minlength=len(self.doc_lengths))
+
+        allowed = self.live if mask is None else self.live & mask
+        candidates = np.flatnonzero((scores > 0) & allowed)
+        if len(candidates) > k:
+            candidates = np.sort(candidates[np.argpartition(-scores[candidates], k - 1)[:k]])
+        # Best first; equal scores keep document order
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return scores[candidates].astype(np.float32), candidates
+
+    def stats(self):
+        postings = sum(len(docs) for docs in self.doc_ids) + sum(len(docs) for batches in self._pending.values() for docs, _ in batches)
+        return {
+            'documents': self.live_count,
+            'terms': len(self.terms),
+            'postings': postings,
+            'bytes': postings * (4 + 2) + self.doc_lengths.nbytes + self.live.nbytes,
+        }
+
+
+def fuse_scores(dense, lexical, method='rrf', weight=0.5, rrf_k=60):
+    """Combine dense and BM25 scores of the same candidates into one score, higher is better.
+
+        rerank   the dense similarity alone; BM25 only chose the candidates
+        linear   weight * dense + (1 - weight) * BM25 scaled by the best candidate's
+        rrf      reciprocal rank fusion, weight on the dense ranking, scaled so that
+                 a candidate ranked first by both scores 1
+    """
+    dense = np.asarray(dense, dtype=np.float32)
+    lexical = np.asarray(lexical, dtype=np.float32)
+    if method == 'rerank':
+        return dense
+    if method == 'linear':
+        best = lexical.max() if len(lexical) else 0.0
+        return weight * dense + (1 - weight) * (lexical / best if best > 0 else lexical)
+    if method == 'rrf':
+        dense_rank = np.empty(len(dense), dtype=np.float32)
+        dense_rank[np.argsort(-dense, kind='stable')] = np.arange(len(dense))
+        lexical_rank = np.empty(len(lexical), dtype=np.float32)
+        lexical_rank[np.argsort(-lexical, kind='stable')] = np.arange(len(lexical))
+        fused = weight / (rrf_k + 1 + dense_rank) + (1 - weight) / (rrf_k + 1 + lexical_rank)
+        return fused * (rrf_k + 1)
+    raise ValueError(f"Unknown fusion method '{method}', expected one of {FUSION_METHODS}")
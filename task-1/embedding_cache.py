@@ -0,0 +1,189 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Persistent store of text embeddings keyed by a hash of the model name and text.
+
+    The vectors and index are rewritten only when entries are added or evicted. Last-use
+    times live in a separate small array, written when a hit's stored time is more than
+    touch_interval seconds old, so a warm run that repeats a recent one writes nothing.
+    """
+
+    def __init__(self, cache_dir, model_name, max_entries=100000, touch_interval=3600):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        # One sub-directory per model so vectors of different widths never mix
+        self.cache_dir = Path(cache_dir) / re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        self.index_path = self.cache_dir / 'index.json'
+        self.vectors_path = self.cache_dir / 'vectors.npy'
+        self.last_used_path = self.cache_dir / 'last_used.npy'
+        self.hits = 0
+        self.misses = 0
+        self.entries = {}
+        self.vectors = None
+        self._load()
+
+    def _load(self):
+        """Load the index and vector matrix from disk, starting empty if missing or corrupt"""
+        if not self.index_path.exists() or not self.vectors_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            vectors = np.load(self.vectors_path)
+            if index.get('model_name') != self.model_name or len(vectors) != len(index['entries']):
+                raise ValueError("index does not match stored vectors")
+            self.entries = index['entries']
+            self.vectors = vectors
+            self._load_last_used()
+            logging.info(f"Loaded {len(self.entries)} cached embeddings from {self.cache_dir}")
+        except Exception as e:
+            logging.warning(f"Discarding unreadable embedding cache {self.cache_dir}: {e}")
+            self.entries = {}
+            self.vectors = None
+
+    def _load_last_used(self):
+        """Attach the stored last-use time of each row to its entry (0 when unknown)"""
+        last_used = None
+        if self.last_used_path.exists():
+            try:
+                last_used = np.load(self.last_used_path)
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable embedding cache timestamps {self.last_used_path}: {e}")
+        if last_used is None or len(last_used) != len(self.vectors):
+            last_used = np.zeros(len(self.vectors))
+        for entry in self.entries.values():
+            # Indexes written before timestamps moved out keep them inline
+            entry['last_used'] = max(float(last_used[entry['row']]), entry.get('last_used', 0.0))
+
+    def _save_last_used(self):
+        last_used = np.zeros(len(self.vectors))
+        for entry in self.entries.values():
+            last_used[entry['row']] = entry['last_used']
+        tmp_path = self.last_used_path.with_suffix('.tmp.npy')
+        np.save(tmp_path, last_used)
+        os.replace(tmp_path, self.last_used_path)
+
+    def _save(self):
+        """Write the index, vectors and last-use times atomically"""
+        if self.vectors is None:
+            self.clear()
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_vectors = self.vectors_path.with_suffix('.tmp.npy')
+        np.save(tmp_vectors, self.vectors)
+        os.replace(tmp_vectors, self.vectors_path)
+
+        tmp_index = self.index_path.with_suffix('.tmp')
+        with open(tmp_index, 'w') as f:
+            json.dump({
+                'model_name': self.model_name,
+                'entries': {key: {'row': entry['row']} for key, entry in self.entries.items()}
+            }, f)
+        os.replace(tmp_index, self.index_path)
+        self._save_last_used()
+
+    def make_key(self, text):
+        """Content hash for a text under this cache's model"""
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode('utf-8')).hexdigest()
+
+    def get_or_encode(self, texts, encode_fn):
+        """Return embeddings for texts, calling encode_fn only for texts not yet cached"""
+        keys = [self.make_key(text) for text in texts]
+        now = time.time()
+
+        # Encode each unseen text once, even if it appears several times
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self.entries and key not in missing:
+                missing[key] = text
+
+        hits = len(keys) - sum(1 for key in keys if key in missing)
+        self.hits += hits
+        self.misses += len(keys) - hits
+
+        if missing:
+            new_vectors = np.asarray(encode_fn(list(missing.values())), dtype=np.float32)
+            start = 0 if self.vectors is None else len(self.vectors)
+            for offset, key in enumerate(missing):
+                self.entries[key] = {'row': start + offset, 'last_used': now}
+            self.vectors = new_vectors if self.vectors is None else np.vstack([self.vectors, new_vectors])
+
+        if not keys:
+            dim = 0 if self.vectors is None else self.vectors.shape[1]
+            return np.empty((0, dim), dtype=np.float32)
+
+        rows = []
+        stale = False
+        for key in keys:
+            entry = self.entries[key]
+            stale = stale or now - entry['last_used'] > self.touch_interval
+            entry['last_used'] = now
+            rows.append(entry['row'])
+        result = self.vectors[rows]
+
+        if self._evict() or missing:
+            self._save()
+        elif stale:
+            self._save_last_used()
+        return result
+
+    def _evict(self):
+        """Drop least recently used entries beyond max_entries and compact the matrix; True if any were dropped"""
+        overflow = len(self.entries) - self.max_entries
+        if overflow <= 0:
+            return False
+        by_age = sorted(self.entries, key=lambda key: self.entries[key]['last_used'])
+        for key in by_age[:overflow]:
+            del self.entries[key]
+        self._compact()
+        logging.info(f"Evicted {overflow} least recently used embeddings")
+        return True
+
+    def _compact(self):
+        """Rebuild the vector matrix so it only holds rows still referenced by the index"""
+        if not self.entries:
+            self.vectors = None
+            return
+        keys = list(self.entries)
+        self.vectors = self.vectors[[self.entries[key]['row'] for key in keys]]
+        for row, key in enumerate(keys):
+            self.entries[key]['row'] = row
+
+    def invalidate(self, texts):
+        """Remove the cached embeddings for the given texts"""
+        removed = 0
+        for text in texts:
+            if self.entries.pop(self.make_key(text), None) is not None:
+                removed += 1
+        if removed:
+            self._compact()
+            self._save()
+        return removed
+
+    def clear(self):
+        """Remove every cached embedding for this model"""
+        self.entries = {}
+        self.vectors = None
+        for path in (self.index_path, self.vectors_path, self.last_used_path):
+            if path.exists():
+                path.unlink()
+
+    def stats(self):
+        """Hit and miss counts since this cache was opened"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self.entries)
+        }
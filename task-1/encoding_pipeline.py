@@ -0,0 +1,83 @@
+import logging
+import time
+
+import numpy as np
+
+
+class EncodingPipeline:
+    """Encodes documents of any length with a SentenceTransformer.
+
+    Texts are tokenized first. Anything longer than the model's sequence limit
+    (which model.encode would silently truncate) is split into overlapping token
+    windows. All chunks are sorted by token length and encoded in buckets of
+    similar length so little compute goes to padding. Chunk embeddings are then
+    mean-pooled, weighted by token count, into one vector per document.
+    """
+
+    def __init__(self, model, max_tokens=None, overlap=32, batch_size=64):
+        self.model = model
+        self.tokenizer = model.tokenizer
+        # Two positions go to the [CLS] and [SEP] tokens the model adds
+        self.max_tokens = (max_tokens or model.max_seq_length) - 2
+        self.overlap = min(overlap, self.max_tokens // 2)
+        self.batch_size = batch_size
+        self.stats = {'documents': 0, 'chunks': 0, 'tokens': 0, 'padded_tokens': 0, 'seconds': 0.0}
+
+    def chunk(self, texts):
+        """[(document index, chunk text, token count)] with every chunk within max_tokens"""
+        encoded = self.tokenizer(list(texts), add_special_tokens=False, return_offsets_mapping=True)
+        stride = self.max_tokens - self.overlap
+        chunks = []
+        for doc, (text, offsets) in enumerate(zip(texts, encoded['offset_mapping'])):
+            if len(offsets) <= self.max_tokens:
+                chunks.append((doc, text, max(len(offsets), 1)))
+                continue
+            for start in range(0, len(offsets) - self.overlap, stride):
+                window = offsets[start:start + self.max_tokens]
+                chunks.append((doc, text[window[0][0]:window[-1][1]], len(window)))
+        return chunks
+
+    def encode(self, texts):
+        """One embedding per text, shape (len(texts), dim)"""
+        texts = [text if isinstance(text, str) else '' for text in texts]
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        start = time.perf_counter()
+        chunks = self.chunk(texts)
+
+        order = sorted(range(len(chunks)), key=lambda i: chunks[i][2])
+        chunk_embeddings = [None] * len(chunks)
+        padded_tokens = 0
+        for bucket_start in range(0, len(order), self.batch_size):
+            bucket = order[bucket_start:bucket_start + self.batch_size]
+            embeddings = self.model.encode([chunks[i][1] for i in bucket], batch_size=len(bucket))
+            for i, embedding in zip(bucket, embeddings):
+                chunk_embeddings[i] = embedding
+            # Every sequence in a batch is padded to its longest member (+2 special tokens)
+            padded_tokens += (chunks[bucket[-1]][2] + 2) * len(bucket)
+
+        dim = len(chunk_embeddings[0])
+        sums = np.zeros((len(texts), dim), dtype=np.float32)
+        weights = np.zeros(len(texts), dtype=np.float32)
+        for (doc, _, n_tokens), embedding in zip(chunks, chunk_embeddings):
+            sums[doc] += n_tokens * np.asarray(embedding, dtype=np.float32)
+            weights[doc] += n_tokens
+        pooled = sums / weights[:, None]
+
+        elapsed = time.perf_counter() - start
+        tokens = sum(n_tokens + 2 for _, _, n_tokens in chunks)
+        for key, value in (('documents', len(texts)), ('chunks', len(chunks)), ('tokens', tokens),
+                           ('padded_tokens', padded_tokens), ('seconds', elapsed)):
+            self.stats[key] += value
+        logging.info(
+            f"Encoded {len(texts)} texts as {len(chunks)} chunks: {tokens / elapsed:,.0f} tokens/s, "
+            f"{tokens / padded_tokens:.0%} of batch positions were real tokens"
+        )
+        return pooled
+
+    def report(self):
+        """Totals over every encode call, with throughput and padding efficiency"""
+        stats = dict(self.stats)
+        stats['tokens_per_second'] = stats['tokens'] / stats['seconds'] if stats['seconds'] else 0.0
+        stats['padding_efficiency'] = stats['tokens'] / stats['padded_tokens'] if stats['padded_tokens'] else 1.0
+        return stats
@@ -0,0 +1,246 @@
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_lock = threading.Lock()
+_enabled = False
+_trace = None
+_spans = {}
+_counters = {}
+_peak_rss = 0
+_started = time.perf_counter()
+
+
+class _NullSpan:
+    """Shared span returned while instrumentation is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end = time.perf_counter()
+        elapsed = end - self.start
+        with _lock:
+            stats = _spans.get(self.name)
+            if stats is None:
+                stats = _spans[self.name] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            if _trace is not None:
+                _trace.append((self.name, self.start, elapsed, threading.get_ident()))
+        return False
+
+
+def enable(trace=False):
+    """Start recording spans and counters; trace also keeps every span for a JSON trace"""
+    global _enabled, _trace
+    _enabled = True
+    _trace = [] if trace else None
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    global _trace, _peak_rss, _started
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _trace = [] if _trace is not None else None
+        _peak_rss = 0
+        _started = time.perf_counter()
+
+
+def span(name):
+    """Context manager timing a block under name; a shared no-op while disabled"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name):
+    """Decorator recording each call of the function as a span"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    """Add n to the counter name"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def sample_rss():
+    """Peak resident set size of this process in bytes so far (None where unsupported)"""
+    global _peak_rss
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    peak = peak if sys.platform == 'darwin' else peak * 1024
+    _peak_rss = max(_peak_rss, peak)
+    return _peak_rss
+
+
+def snapshot():
+    """Current spans, counters and peak RSS as plain data"""
+    sample_rss()
+    with _lock:
+        return {
+            'uptime_seconds': time.perf_counter() - _started,
+            'peak_rss_bytes': _peak_rss or None,
+            'spans': {name: {'count': n, 'total_seconds': total, 'max_seconds': longest}
+                      for name, (n, total, longest) in sorted(_spans.items())},
+            'counters': dict(sorted(_counters.items())),
+        }
+
+
+def _metric_name(name):
+    return 'resume_shortlister_' + ''.join(c if c.isalnum() else '_' for c in name)
+
+
+def prometheus_text():
+    """The snapshot in the Prometheus text exposition format"""
+    data = snapshot()
+    lines = []
+    for name, stats in data['spans'].items():
+        metric = _metric_name(name) + '_seconds'
+        lines += [f"# TYPE {metric} summary",
+                  f"{metric}_count {stats['count']}",
+                  f"{metric}_sum {stats['total_seconds']:.6f}",
+                  f"# TYPE {metric}_max gauge",
+                  f"{metric}_max {stats['max_seconds']:.6f}"]
+    for name, value in data['counters'].items():
+        metric = _metric_name(name) + '_total'
+        lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+    if data['peak_rss_bytes']:
+        metric = _metric_name('peak_rss_bytes')
+        lines += [f"# TYPE {metric} gauge", f"{metric} {data['peak_rss_bytes']}"]
+    return '\n'.join(lines) + '\n'
+
+
+def trace_json():
+    """The snapshot plus, when tracing, every span as a Chrome trace event (chrome://tracing, Perfetto)"""
+    data = snapshot()
+    with _lock:
+        events = list(_trace or [])
+    data['traceEvents'] = [
+        {'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': tid,
+         'ts': (start - _started) * 1e6, 'dur': elapsed * 1e6}
+        for name, start, elapsed, tid in events
+    ]
+    return data
+
+
+def write_report(path):
+    """Write the metrics to path: JSON for .json, Prometheus text format otherwise"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        if path.suffix == '.json':
+            json.dump(trace_json(), f, indent=2)
+        else:
+            f.write(prometheus_text())
+    # Atomic so a Prometheus textfile collector never reads a partial file
+    os.replace(tmp_path, path)
+    logging.info(f"Wrote metrics to {path}")
+
+
+@contextlib.contextmanager
+def profile(kind, output=None):
+    """Profile the block with 'cprofile' or 'pyinstrument', writing to output or printing a summary"""
+    if kind == 'cprofile':
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            if output:
+                profiler.dump_stats(output)
+            else:
+                pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+    elif kind == 'pyinstrument':
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+            if output:
+                Path(output).write_text(profiler.output_html(), encoding='utf-8')
+            else:
+                print(profiler.output_text(unicode=True))
+    else:
+        raise ValueError(f"Unknown profiler '{kind}', expected 'cprofile' or 'pyinstrument'")
+
+
+def add_arguments(parser):
+    """Add --metrics-path, --trace, --profile and --profile-output to a CLI"""
+    parser.add_argument('--metrics-path', default=None,
+                        help="Record stage timings and counters and write them here "
+                             "(.json for a JSON trace, anything else for Prometheus text format)")
+    parser.add_argument('--trace', action='store_true',
+                        help="With a .json --metrics-path, also keep every span as a trace event")
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'], default=None,
+                        help="Profile the whole run")
+    parser.add_argument('--profile-output', default=None,
+                        help="Profile file (.prof for cProfile, .html for pyinstrument) instead of printing")
+
+
+@contextlib.contextmanager
+def from_args(args):
+    """Instrument and profile the block as the arguments from add_arguments ask"""
+    if args.metrics_path:
+        enable(trace=args.trace)
+    with profile(args.profile, args.profile_output) if args.profile else contextlib.nullcontext():
+        try:
+            yield
+        finally:
+            if args.metrics_path:
+                write_report(args.metrics_path)
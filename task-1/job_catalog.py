@@ -0,0 +1,249 @@
+import logging
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+
+from lazy_imports import LazyModule
+from srn_store import iter_job_records
+
+pd = LazyModule('pandas')
+
+# Paraform CSV columns; SRN records are mapped onto the same names
+TEXT_COLUMNS = [
+    'Link', 'Company', 'Role', 'One liner', 'Reward', 'Locations', 'Tech Stack', 'Workplace',
+    'Salary', 'Equity', 'Visa', 'YOE', 'Team Size', 'Funding', 'Website', 'Requirements', 'Industry',
+    'timestamp', 'fingerprint', 'html_key', 'source_url'
+]
+# Parsed once at ingest so filters and scoring never re-parse the text fields
+NUMERIC_COLUMNS = ['Min Salary', 'Max Salary', 'Min YOE', 'Max YOE']
+CATALOG_COLUMNS = ['source'] + TEXT_COLUMNS + NUMERIC_COLUMNS + ['combined_text', 'Workplace Type']
+
+# Few distinct values: read back as pandas categoricals
+CATEGORICAL_COLUMNS = ['source', 'Workplace', 'Visa', 'YOE', 'Industry', 'Funding', 'Workplace Type']
+
+WORKPLACE_TYPES = ['remote', 'hybrid', 'onsite']
+
+# Fields embedded for matching, in order
+COMBINED_TEXT_FIELDS = ['Role', 'Tech Stack', 'One liner', 'Requirements', 'Industry', 'Workplace', 'YOE']
+
+SALARY_AMOUNT = re.compile(r'(\d+(?:\.\d+)?)\s*([km])?')
+SALARY_MULTIPLIERS = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_salary_range(salary_str):
+    """(min, max) from '$150k - $180k', '$120,000 – $200,000 + Equity' or '$150,000'; (None, None) if unparseable"""
+    if not isinstance(salary_str, str):
+        return None, None
+    salary = salary_str.lower().replace('$', '').replace(',', '')
+    # Handle equity or additional compensation
+    if '+' in salary and 'equity' in salary:
+        salary = salary.split('+')[0]
+
+    amounts = [
+        float(number) * SALARY_MULTIPLIERS.get(unit, 1)
+        for number, unit in SALARY_AMOUNT.findall(re.sub(r'\s*[-–—]\s*', ' - ', salary))
+    ][:2]
+    if not amounts:
+        return None, None
+    return amounts[0], amounts[-1]
+
+
+def parse_yoe_range(yoe):
+    """(min, max) years from '3+ years' (max None), '2 - 6 years' or '4 years'; (None, None) if unparseable"""
+    if _is_missing(yoe):
+        return None, None
+    text = str(yoe).replace('years', '').replace('year', '')
+    try:
+        if '+' in text:
+            return float(text.replace('+', '').strip()), None
+        if '-' in text:
+            years_range = [float(part.strip()) for part in text.split('-')]
+            return years_range[0], years_range[1]
+        years = float(text.strip())
+        return years, years
+    except (ValueError, IndexError):
+        return None, None
+
+
+def workplace_type(workplace, locations=None):
+    """'remote', 'hybrid', 'onsite', or None when neither field says"""
+    text = '' if _is_missing(workplace) else str(workplace).lower()
+    if 'remote' in text:
+        return 'remote'
+    if 'hybrid' in text:
+        return 'hybrid'
+    if any(word in text for word in ('on-site', 'onsite', 'in office', 'in-office', 'in person')):
+        return 'onsite'
+    if not _is_missing(locations) and 'remote' in str(locations).lower():
+        return 'remote'
+    return None
+
+
+def combined_text(job):
+    """Text embedded for a job.
+
+    Missing values render as 'nan', exactly as the row-wise f-string over the merged
+    DataFrame did, so embeddings cached before the catalog still match.
+    """
+    return ' '.join('nan' if _is_missing(job.get(field, '')) else str(job.get(field, ''))
+                    for field in COMBINED_TEXT_FIELDS)
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _quote(column):
+    return f'"{column}"'
+
+
+def _to_sql_value(value):
+    if _is_missing(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def standardize_srn_job(job):
+    """Map an SRN record (current or legacy lowercase keys) onto the Paraform columns"""
+    # Legacy scrapes used lowercase keys; never let a missing one overwrite the current field
+    for old_key, new_key in (('title', 'Role'), ('company', 'Company'), ('location', 'Locations'),
+                             ('workplace', 'Workplace'), ('salary', 'Salary')):
+        if old_key in job:
+            job.setdefault(new_key, job.pop(old_key))
+        job.setdefault(new_key, '')
+
+    job['Tech Stack'] = job.get('Tech Stack', '')
+    job['One liner'] = job.get('One liner', '')
+    job['Equity'] = job.get('Equity', 'Not specified')
+    job['Visa'] = job.get('Visa', 'Contact company')
+    job['YOE'] = job.get('YOE', 'Not specified')
+    job['Team Size'] = job.get('Team Size', 'Not specified')
+    job['Funding'] = job.get('Funding', 'Not specified')
+    job['Requirements'] = job.get('Requirements', '')
+    job['Industry'] = job.get('Industry', 'Tech')
+    return job
+
+
+class SourceAdapter:
+    """A job source backed by one file; the catalog re-ingests it only when the file changes"""
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = Path(path)
+
+    def signature(self):
+        """Path, size and mtime of the source file"""
+        stat = self.path.stat()
+        return f"{self.path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def records(self):
+        raise NotImplementedError
+
+
+class ParaformCSVAdapter(SourceAdapter):
+    def __init__(self, path, name='Paraform'):
+        super().__init__(name, path)
+
+    def records(self):
+        return pd.read_csv(self.path).to_dict('records')
+
+
+class SRNJobsAdapter(SourceAdapter):
+    """srn_jobs.jsonl, or a legacy srn_jobs.json when no JSONL snapshot exists"""
+
+    def __init__(self, path, name='SRN'):
+        path = Path(path)
+        if not path.exists() and path.suffix == '.jsonl':
+            path = path.with_suffix('.json')
+        super().__init__(name, path)
+
+    def records(self):
+        return (standardize_srn_job(job) for job in iter_job_records(self.path))
+
+
+class JobCatalog:
+    """Normalized SQLite catalog of jobs from every source.
+
+    Salaries are stored as numeric min/max columns and combined_text is computed at
+    ingest, so loading jobs is a column-projected read. Each source is re-ingested
+    only when its file changes, replacing just that source's rows.
+    """
+
+    def __init__(self, path='job_catalog.sqlite'):
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.create_schema()
+
+    def create_schema(self):
+        # Columns are untyped so Team Size keeps Paraform's integers and SRN's strings as-is
+        columns = ', '.join(_quote(column) for column in TEXT_COLUMNS)
+        numeric = ', '.join(f'{_quote(column)} REAL' for column in NUMERIC_COLUMNS)
+        with self.conn:
+            existing = [row[1] for row in self.conn.execute('PRAGMA table_info(jobs)')]
+            if existing and existing != ['source', 'position'] + CATALOG_COLUMNS[1:]:
+                # Written by an older version: drop it and re-ingest every source on the next sync
+                logging.info(f"Rebuilding job catalog {self.path} for the current schema")
+                self.conn.execute('DROP TABLE jobs')
+                self.conn.execute('DROP TABLE IF EXISTS sources')
+            self.conn.execute(
+                f'CREATE TABLE IF NOT EXISTS jobs (source TEXT NOT NULL, position INTEGER NOT NULL, '
+                f'{columns}, {numeric}, combined_text TEXT, "Workplace Type" TEXT, PRIMARY KEY (source, position))'
+            )
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, path TEXT, signature TEXT, '
+                'job_count INTEGER, ingested_at TEXT)'
+            )
+
+    def sync(self, adapter):
+        """Ingest adapter's records if its file changed since the last sync; returns True if it did"""
+        signature = adapter.signature()
+        row = self.conn.execute('SELECT signature FROM sources WHERE name = ?', (adapter.name,)).fetchone()
+        if row and row[0] == signature:
+            return False
+
+        start = time.perf_counter()
+        rows = []
+        for position, job in enumerate(adapter.records()):
+            rows.append(
+                [adapter.name, position]
+                + [_to_sql_value(job.get(column)) for column in TEXT_COLUMNS]
+                + list(parse_salary_range(job.get('Salary'))) + list(parse_yoe_range(job.get('YOE')))
+                + [combined_text(job), workplace_type(job.get('Workplace'), job.get('Locations'))]
+            )
+
+        placeholders = ', '.join('?' * (len(CATALOG_COLUMNS) + 1))
+        with self.conn:
+            self.conn.execute('DELETE FROM jobs WHERE source = ?', (adapter.name,))
+            self.conn.executemany(f'INSERT INTO jobs VALUES ({placeholders})', rows)
+            self.conn.execute(
+                'INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?)',
+                (adapter.name, str(adapter.path), signature, len(rows), time.strftime('%Y-%m-%d %H:%M:%S'))
+            )
+        logging.info(f"Ingested {len(rows)} {adapter.name} jobs into the catalog in {time.perf_counter() - start:.2f}s")
+        return True
+
+    def read(self, sources, columns=None):
+        """DataFrame of the given sources' jobs in source order, optionally only some columns"""
+        columns = columns or CATALOG_COLUMNS
+        sources = list(sources)
+        if not sources:
+            return pd.DataFrame(columns=columns)
+        order = ' '.join(f'WHEN ? THEN {rank}' for rank in range(len(sources)))
+        query = (
+            f'SELECT {", ".join(_quote(column) for column in columns)} FROM jobs '
+            f'WHERE source IN ({", ".join("?" * len(sources))}) ORDER BY CASE source {order} END, position'
+        )
+        df = pd.read_sql_query(query, self.conn, params=sources + sources)
+        for column in df.columns:
+            if column in CATEGORICAL_COLUMNS:
+                df[column] = df[column].astype('category')
+            elif column not in NUMERIC_COLUMNS:
+                # NULL comes back as None; use NaN like the CSV loader did
+                df[column] = df[column].astype(object).where(df[column].notna(), np.nan)
+        return df
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,105 @@
+import numpy as np
+
+from job_catalog import WORKPLACE_TYPES
+
+
+def _number(name, value):
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number, got {value!r}")
+
+
+def _strings(name, value):
+    """None, or a list of strings from a string or a list of them"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{name} must be a string or a list of strings, got {value!r}")
+    return list(value)
+
+
+def _flag(name, value):
+    if not isinstance(value, bool):
+        raise ValueError(f"{name} must be true or false, got {value!r}")
+    return value
+
+
+class JobFilter:
+    """Hard constraints on jobs, evaluated column-wise into a boolean mask over jobs_df.
+
+    Every constraint that is set must hold. A job whose field is unknown (no parsable
+    salary, no stated YOE, no workplace type) fails that constraint unless keep_unknown.
+
+        workplace      workplace types allowed, from 'remote', 'hybrid', 'onsite'
+        min_salary     the job's lower salary bound is at least this
+        max_yoe        the job asks for at most this many years (the candidate's experience)
+        locations      the job's locations mention any of these (case-insensitive)
+        needs_visa     drop jobs that state they cannot sponsor visas
+        sources        only jobs from these sources ('Paraform', 'SRN')
+    """
+
+    def __init__(self, workplace=None, min_salary=None, max_yoe=None, locations=None, needs_visa=False,
+                 sources=None, keep_unknown=False):
+        # Values may come straight from a JSON request, so they are checked and coerced here
+        workplace = _strings('workplace', workplace)
+        unknown = set(workplace or ()) - set(WORKPLACE_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown workplace types {sorted(unknown)}, expected some of {WORKPLACE_TYPES}")
+        self.workplace = workplace or None
+        self.min_salary = _number('min_salary', min_salary)
+        self.max_yoe = _number('max_yoe', max_yoe)
+        self.locations = _strings('locations', locations)
+        self.needs_visa = _flag('needs_visa', needs_visa)
+        self.sources = _strings('sources', sources)
+        self.keep_unknown = _flag('keep_unknown', keep_unknown)
+
+    @classmethod
+    def remote_only(cls, **constraints):
+        return cls(workplace=['remote'], **constraints)
+
+    def is_empty(self):
+        return not (self.workplace or self.min_salary is not None or self.max_yoe is not None
+                    or self.locations or self.needs_visa or self.sources)
+
+    def mask(self, jobs_df):
+        """Boolean array, True for the rows of jobs_df that pass every constraint"""
+        mask = np.ones(len(jobs_df), dtype=bool)
+        if self.workplace:
+            workplace = jobs_df['Workplace Type']
+            mask &= workplace.isin(self.workplace).to_numpy() | self._unknown(workplace)
+        if self.min_salary is not None:
+            salary = jobs_df['Min Salary']
+            mask &= (salary >= self.min_salary).to_numpy() | self._unknown(salary)
+        if self.max_yoe is not None:
+            yoe = jobs_df['Min YOE']
+            mask &= (yoe <= self.max_yoe).to_numpy() | self._unknown(yoe)
+        if self.locations:
+            locations = jobs_df['Locations'].astype(object).fillna('').astype(str).str.lower()
+            matched = np.zeros(len(jobs_df), dtype=bool)
+            for location in self.locations:
+                matched |= locations.str.contains(location.lower(), regex=False).to_numpy()
+            mask &= matched | self._unknown(jobs_df['Locations'])
+        if self.needs_visa:
+            # Only an explicit "Not available ..." rules a job out; unknown or "Contact company" stay in
+            visa = jobs_df['Visa'].astype(object).fillna('').astype(str).str.lower()
+            mask &= ~visa.str.startswith('not available').to_numpy()
+        if self.sources:
+            mask &= jobs_df['source'].isin(self.sources).to_numpy()
+        return mask
+
+    def _unknown(self, column):
+        if not self.keep_unknown:
+            return np.zeros(len(column), dtype=bool)
+        return column.isna().to_numpy()
+
+    def __repr__(self):
+        constraints = ', '.join(f"{key}={value!r}" for key, value in vars(self).items()
+                                if value not in (None, False) and key != 'keep_unknown')
+        return f"JobFilter({constraints})"
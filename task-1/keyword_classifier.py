@@ -0,0 +1,147 @@
+import re
+
+
+def _trie_pattern(keywords):
+    """Regex matching the longest of keywords at a position, factored as a trie so
+    each position costs one character test instead of one per keyword"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional suffix: prefer extending the match, fall back to the keyword ending here
+        return '(?:' + body + ')?' if '' in node else body
+
+    return emit(trie)
+
+
+class KeywordClassifier:
+    """Labels defined as keyword lists, compiled once for repeated classification.
+
+    classify() returns every label with a keyword occurring anywhere in the
+    lowercased text, i.e. `any(kw in text.lower() for kw in keywords)` for all
+    labels at once, lowercasing the text a single time.
+
+    Small keyword sets are checked with C-level substring search, which beats a
+    regex in CPython. Sets larger than regex_threshold are compiled into one trie
+    regex scanned in a single pass: a lookahead reports the longest keyword at each
+    position and every keyword that is a prefix of it is implied, so overlapping
+    keywords ('java' in 'javascript', 'ai' in 'maintain') still count.
+    """
+
+    # Where the regex overtakes the scans on synthetic tables; see benchmarks/bench_classifier.py
+    regex_threshold = 128
+
+    def __init__(self, labels):
+        self.labels = list(labels)
+        keyword_labels = {}
+        for label, keywords in labels.items():
+            for keyword in keywords:
+                keyword_labels.setdefault(keyword.lower(), set()).add(label)
+
+        keywords = list(keyword_labels)
+        self.keyword_labels = [(keyword, frozenset(keyword_labels[keyword])) for keyword in keywords]
+        self.pattern = None
+        if len(keywords) > self.regex_threshold:
+            self.pattern = re.compile('(?=(' + _trie_pattern(keywords) + '))')
+            self.implied = {
+                keyword: frozenset().union(*(keyword_labels[other] for other in keywords if keyword.startswith(other)))
+                for keyword in keywords
+            }
+
+    def classify(self, text):
+        """Set of labels found in text"""
+        text = text.lower()
+        found = set()
+        if self.pattern is None:
+            for keyword, labels in self.keyword_labels:
+                if keyword in text:
+                    found |= labels
+        else:
+            for keyword in set(self.pattern.findall(text)):
+                found |= self.implied[keyword]
+        return found
+
+    def classify_ordered(self, text):
+        """Labels found in text, in the order they were defined"""
+        found = self.classify(text)
+        return [label for label in self.labels if label in found]
+
+
+def _single(*keywords):
+    return {keyword: [keyword.lower()] for keyword in keywords}
+
+
+# SRN scraper: technologies mentioned in a job card
+TECH_KEYWORDS = _single(
+    'Python', 'JavaScript', 'TypeScript', 'React', 'Node.js', 'AWS',
+    'GCP', 'Azure', 'Docker', 'Kubernetes', 'PostgreSQL', 'MongoDB',
+    'Redis', 'GraphQL', 'REST', 'FastAPI', 'Django', 'Flask', 'Vue',
+    'Angular', 'Next.js', 'Express', 'Go', 'Rust', 'Java', 'C++',
+    'TensorFlow', 'PyTorch', 'OpenAI', 'Git', 'CI/CD'
+)
+
+# SRN scraper: industry of a job card
+INDUSTRY_KEYWORDS = {
+    'AI': ['ai', 'machine learning', 'deep learning', 'ml', 'artificial intelligence'],
+    'Fintech': ['fintech', 'financial', 'banking', 'payment'],
+    'Enterprise': ['enterprise', 'b2b', 'saas'],
+    'Data': ['data', 'analytics', 'big data'],
+    'DevTools': ['developer', 'tools', 'devtools', 'dev tools'],
+}
+
+# Candidate matcher: signals read from a candidate's current title
+TITLE_KEYWORDS = {
+    'founding': ['founding'],
+    'staff': ['staff'],
+    'senior': ['senior'],
+    'software engineer': ['software engineer'],
+    'ai/ml': ['ai', 'ml', 'machine learning'],
+    'full stack': ['full stack', 'fullstack'],
+    'startup title': ['founding', 'founder', 'early'],
+    'founder level': ['founding', 'founder'],
+    'staff level': ['staff', 'principal'],
+    'senior level': ['senior', 'lead'],
+    'frontend skills': ['frontend', 'full stack'],
+    'backend skills': ['backend', 'full stack'],
+    'ai skills': ['ai', 'ml'],
+}
+
+# Candidate matcher: signals read from a candidate's current company
+COMPANY_KEYWORDS = {
+    'ai company': ['waymo', 'scale', 'glean', 'openai', 'anthropic'],
+    'ml company': ['waymo', 'scale', 'openai'],
+    'big tech': ['google', 'meta', 'amazon', 'microsoft', 'apple'],
+    'large company': ['google', 'meta', 'amazon', 'microsoft', 'apple', 'waymo'],
+}
+
+# Candidate matcher: signals read from "title company"
+PROFILE_KEYWORDS = {
+    'startup': ['founding', 'founder', 'early', 'seed', 'series a'],
+    'aws': ['aws', 'amazon', 'cloud'],
+    'gcp': ['gcp', 'google cloud'],
+    'python': ['python', 'django', 'flask'],
+    'react': ['react', 'frontend', 'web'],
+    'typescript': ['typescript', 'javascript', 'frontend'],
+}
+TECH_STACK_LABELS = ['aws', 'gcp', 'python', 'react', 'typescript']
+
+# Candidate matcher: education tiers
+EDUCATION_KEYWORDS = {
+    'top school': ['stanford', 'mit', 'berkeley', 'carnegie mellon', 'princeton', 'harvard', 'yale'],
+    'good school': ['cornell', 'columbia', 'ucla', 'ucsd', 'university of michigan', 'georgia tech', 'caltech'],
+}
+
+TECH_CLASSIFIER = KeywordClassifier(TECH_KEYWORDS)
+INDUSTRY_CLASSIFIER = KeywordClassifier(INDUSTRY_KEYWORDS)
+TITLE_CLASSIFIER = KeywordClassifier(TITLE_KEYWORDS)
+COMPANY_CLASSIFIER = KeywordClassifier(COMPANY_KEYWORDS)
+PROFILE_CLASSIFIER = KeywordClassifier(PROFILE_KEYWORDS)
+EDUCATION_CLASSIFIER = KeywordClassifier(EDUCATION_KEYWORDS)
@@ -0,0 +1,37 @@
+import importlib
+import threading
+import types
+
+_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is only imported on first attribute access.
+
+    `pd = LazyModule('pandas')` keeps pandas out of startup until something
+    actually uses `pd.<name>`; after that the real module's attributes are
+    copied in, so later lookups cost the same as on the module itself.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._lazy_module = None
+
+    def _load(self):
+        if self._lazy_module is None:
+            with _lock:
+                if self._lazy_module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__.update(module.__dict__)
+                    self._lazy_module = module
+        return self._lazy_module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self._lazy_module is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
@@ -0,0 +1,199 @@
+import base64
+import io
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import instrumentation
+from job_filters import JobFilter
+from pdf_extraction import extract_pdf_text
+from resume_watcher import _json_default
+
+
+class MicroBatcher:
+    """Groups items submitted from many threads into batches for one function call.
+
+    A batch is dispatched once it holds max_batch_size items or max_wait seconds after
+    its first item arrived, whichever comes first, so a lone request waits at most
+    max_wait while concurrent ones share a single model.encode call.
+    """
+
+    def __init__(self, fn, max_batch_size=32, max_wait=0.005):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.items = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, item):
+        """Queue one item; the returned Future resolves to fn's result for it"""
+        future = Future()
+        self.queue.put((item, future))
+        return future
+
+    def _next_batch(self):
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            items = [item for item, _ in batch]
+            try:
+                results = self.fn(items)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            instrumentation.count('server.encode_batches')
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class MatchRequestHandler(BaseHTTPRequestHandler):
+    """POST /match with a PDF body (Content-Type: application/pdf) or JSON
+    {"text": ...} / {"pdf_base64": ...}, optionally with "n" and a "filter" of JobFilter
+    arguments (e.g. {"workplace": ["remote"], "min_salary": 150000}); GET /health and /metrics"""
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            body = instrumentation.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path != '/health':
+            self.send_json(404, {'error': 'Not found'})
+            return
+        batcher = self.server.batcher
+        self.send_json(200, {
+            'status': 'ok',
+            'jobs': len(self.server.matcher.jobs_df),
+            'batches': batcher.batches,
+            'mean_batch_size': batcher.items / batcher.batches if batcher.batches else 0.0
+        })
+
+    def do_POST(self):
+        if self.path != '/match':
+            self.send_json(404, {'error': 'Not found'})
+            return
+        start = time.perf_counter()
+        instrumentation.count('server.requests')
+        try:
+            resume_text, n, job_filter = self.read_request()
+        except (ValueError, TypeError) as e:
+            self.send_json(400, {'error': str(e)})
+            return
+
+        try:
+            with instrumentation.span('server.match'):
+                # Keyword retrieval never encodes, so there is nothing to batch
+                embedding = (
+                    None if self.server.matcher.retrieval_mode == 'keyword'
+                    else self.server.batcher.submit(resume_text).result()
+                )
+                matches = self.server.matcher.find_top_matches(
+                    resume_text, n=n, resume_embedding=embedding, job_filter=job_filter
+                )
+        except Exception as e:
+            logging.error(f"Error matching resume: {str(e)}")
+            self.send_json(500, {'error': str(e)})
+            return
+        self.send_json(200, {'matches': matches, 'elapsed_ms': (time.perf_counter() - start) * 1000})
+
+    def read_request(self):
+        """(resume text, n, JobFilter or None) from the request body"""
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        n = self.server.default_n
+        job_filter = None
+        if self.headers.get('Content-Type', '').startswith('application/pdf'):
+            pdf_bytes = body
+        else:
+            try:
+                payload = json.loads(body or b'{}')
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                raise ValueError('Body must be JSON or a PDF')
+            if not isinstance(payload, dict):
+                raise ValueError('JSON body must be an object')
+            n = payload.get('n', n)
+            if isinstance(n, bool) or not isinstance(n, int) or n < 1:
+                raise ValueError(f'"n" must be a positive integer, got {n!r}')
+            if payload.get('filter'):
+                if not isinstance(payload['filter'], dict):
+                    raise ValueError('"filter" must be an object of JobFilter fields')
+                job_filter = JobFilter(**payload['filter'])
+            if payload.get('text'):
+                if not isinstance(payload['text'], str):
+                    raise ValueError('"text" must be a string')
+                return payload['text'], n, job_filter
+            if not payload.get('pdf_base64'):
+                raise ValueError('Provide "text" or "pdf_base64"')
+            pdf_bytes = base64.b64decode(payload['pdf_base64'])
+
+        resume_text = extract_pdf_text(io.BytesIO(pdf_bytes))
+        if not resume_text:
+            raise ValueError('Could not extract text from the PDF')
+        return resume_text, n, job_filter
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, default=_json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+
+class MatchServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Bursts of concurrent clients would otherwise overflow the default listen backlog of 5
+    request_queue_size = 128
+
+
+def create_server(matcher, host='127.0.0.1', port=8765, n=2, max_batch_size=32, max_wait_ms=5):
+    """HTTP server answering match requests against an already loaded matcher"""
+    server = MatchServer((host, port), MatchRequestHandler)
+    server.matcher = matcher
+    server.default_n = n
+    server.batcher = MicroBatcher(
+        lambda texts: np.asarray(matcher.encode_resumes(texts, batch_size=max_batch_size)),
+        max_batch_size=max_batch_size, max_wait=max_wait_ms / 1000
+    )
+    return server
+
+
+def serve(matcher, host='127.0.0.1', port=8765, n=2, max_batch_size=32, max_wait_ms=5):
+    """Serve until interrupted"""
+    server = create_server(matcher, host, port, n, max_batch_size, max_wait_ms)
+    logging.info(f"Serving matches on http://{host}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Stopped match server")
+    finally:
+        server.server_close()
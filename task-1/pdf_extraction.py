@@ -0,0 +1,192 @@
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from pathlib import Path
+
+from lazy_imports import LazyModule
+
+pdfplumber = LazyModule('pdfplumber')
+
+
+def extract_pdf_text(pdf_path):
+    """Extract text content from PDF; module level so process pool workers can run it"""
+    try:
+        text = ""
+        with pdfplumber.open(pdf_path) as pdf:
+            for page in pdf.pages:
+                text += (page.extract_text() or "") + "\n"
+        return text
+    except Exception as e:
+        logging.error(f"Error extracting text from PDF {pdf_path}: {str(e)}")
+        return None
+
+
+def file_sha256(path, block_size=1 << 20):
+    """Hash a file's contents without reading it into memory at once"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TextCache:
+    """Persistent cache of extracted PDF text keyed by path, size, mtime and content hash"""
+
+    def __init__(self, cache_path):
+        self.cache_path = Path(cache_path)
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                logging.warning(f"Discarding unreadable text cache {self.cache_path}: {e}")
+        self._by_hash = {entry['sha256']: key for key, entry in self.entries.items()}
+
+    def lookup(self, path):
+        """Return (text, fingerprint); text is None when the file has to be parsed.
+
+        Size and mtime short-circuit the check, so unchanged files are never read.
+        A touched or renamed file is still a hit when its content hash matches.
+        """
+        key = str(Path(path).resolve())
+        stat = os.stat(path)
+        fingerprint = {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+        entry = self.entries.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            self.hits += 1
+            return entry['text'], dict(fingerprint, sha256=entry['sha256'])
+
+        fingerprint['sha256'] = file_sha256(path)
+        known_key = self._by_hash.get(fingerprint['sha256'])
+        if known_key is not None and known_key in self.entries:
+            self.hits += 1
+            text = self.entries[known_key]['text']
+            self.store(path, fingerprint, text)
+            return text, fingerprint
+
+        self.misses += 1
+        return None, fingerprint
+
+    def store(self, path, fingerprint, text):
+        key = str(Path(path).resolve())
+        self.entries[key] = dict(fingerprint, text=text)
+        self._by_hash[fingerprint['sha256']] = key
+        self._dirty = True
+
+    def prune(self, paths):
+        """Forget cached files that are no longer among paths"""
+        keep = {str(Path(path).resolve()) for path in paths}
+        for key in [key for key in self.entries if key not in keep]:
+            del self.entries[key]
+            self._dirty = True
+        self._by_hash = {entry['sha256']: key for key, entry in self.entries.items()}
+
+    def save(self):
+        if not self._dirty:
+            return
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+
+
+def extract_texts(pdf_paths, workers=1, timeout=60, cache=None, prune=False):
+    """Extract text from many PDFs, returning {path: text} for the files that succeeded.
+
+    With workers > 1 files are parsed in a process pool and any file that takes
+    longer than timeout seconds is skipped; with workers == 1 they are parsed
+    in-process one at a time. With prune, cached files missing from pdf_paths
+    (deleted or renamed resumes) are dropped from the cache.
+    """
+    texts = {}
+    to_parse = []
+    fingerprints = {}
+    for path in pdf_paths:
+        if cache is None:
+            to_parse.append(path)
+            continue
+        try:
+            text, fingerprints[path] = cache.lookup(path)
+        except OSError as e:
+            logging.error(f"Error reading resume {path}: {str(e)}")
+            continue
+        if text is None:
+            to_parse.append(path)
+        else:
+            texts[path] = text
+
+    if cache is not None:
+        logging.info(f"Text cache: {len(texts)} hits, {len(to_parse)} misses")
+
+    if workers <= 1 or len(to_parse) <= 1:
+        for path in to_parse:
+            _collect(path, extract_pdf_text(path), texts, fingerprints, cache)
+    else:
+        for path, text in _extract_in_pool(to_parse, min(workers, len(to_parse)), timeout):
+            _collect(path, text, texts, fingerprints, cache)
+
+    if cache is not None:
+        if prune:
+            cache.prune(pdf_paths)
+        cache.save()
+    return texts
+
+
+def _extract_in_pool(paths, workers, timeout, poll_interval=0.05):
+    """Yield (path, text) as a process pool parses the files, skipping any that run past timeout.
+
+    At most one file per worker is in flight, so a file's deadline starts when a worker
+    picks it up. When one expires the pool is killed, since a worker stuck on a
+    pathological PDF never frees its slot, and the other in-flight files are resubmitted
+    to a fresh pool.
+    """
+    pending = deque(paths)
+    in_flight = {}  # path -> (AsyncResult, deadline)
+    pool = multiprocessing.Pool(processes=workers)
+    try:
+        while pending or in_flight:
+            while pending and len(in_flight) < workers:
+                path = pending.popleft()
+                in_flight[path] = (pool.apply_async(extract_pdf_text, (str(path),)), time.monotonic() + timeout)
+
+            next(iter(in_flight.values()))[0].wait(poll_interval)
+            now = time.monotonic()
+            expired = []
+            for path, (result, deadline) in list(in_flight.items()):
+                if result.ready():
+                    del in_flight[path]
+                    yield path, result.get()
+                elif now > deadline:
+                    expired.append(path)
+
+            if expired:
+                for path in expired:
+                    del in_flight[path]
+                    logging.warning(f"Timed out after {timeout}s extracting text from {path}, skipping")
+                pool.terminate()
+                pool.join()
+                pool = multiprocessing.Pool(processes=workers)
+                pending.extendleft(reversed(list(in_flight)))
+                in_flight = {}
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _collect(path, text, texts, fingerprints, cache):
+    if not text:
+        return
+    texts[path] = text
+    if cache is not None:
+        cache.store(path, fingerprints[path], text)
@@ -0,0 +1,92 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b'QEMB\x00\x01'
+# Codes start on this boundary so memmapped rows stay aligned
+ALIGNMENT = 64
+DTYPES = {'int8': np.int8, 'float16': np.float16}
+
+
+def quantize(vectors, dtype='int8', scales=None):
+    """(codes, scales) with vectors ~= codes * scales.
+
+    int8 uses a symmetric per-dimension scale (the dimension's largest magnitude
+    maps to 127); values beyond an existing scale are clipped. float16 keeps
+    unit scales and only halves the precision.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if dtype == 'float16':
+        if scales is None:
+            scales = np.ones(vectors.shape[1], dtype=np.float32)
+        return (vectors / scales).astype(np.float16), scales
+    if dtype != 'int8':
+        raise ValueError(f"Unsupported quantized dtype '{dtype}', expected one of {sorted(DTYPES)}")
+    if scales is None:
+        scales = np.abs(vectors).max(axis=0) / 127 if len(vectors) else np.ones(vectors.shape[1])
+        scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scales), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+def dequantize(codes, scales):
+    return codes.astype(np.float32) * scales
+
+
+def save_quantized(path, codes, scales, **metadata):
+    """Write codes and scales to one flat file: magic, JSON header, padding, scales, codes"""
+    header = json.dumps({
+        'dtype': np.dtype(codes.dtype).name,
+        'shape': list(codes.shape),
+        'metadata': {key: value if isinstance(value, (int, float, bool)) else str(value)
+                     for key, value in metadata.items()}
+    }).encode('utf-8')
+    prefix = len(MAGIC) + 4 + len(header)
+    padding = -prefix % ALIGNMENT
+    scales = np.asarray(scales, dtype=np.float32)
+    # Scales take a multiple of ALIGNMENT bytes too, keeping the codes aligned
+    scales_padding = -scales.nbytes % ALIGNMENT
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(4, 'little'))
+        f.write(header)
+        f.write(b'\0' * padding)
+        f.write(scales.tobytes())
+        f.write(b'\0' * scales_padding)
+        f.write(np.ascontiguousarray(codes).tobytes())
+    os.replace(tmp_path, path)
+
+
+def is_quantized_file(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def open_quantized(path):
+    """(codes, scales, metadata) with codes memory-mapped read-only, so processes
+    opening the same file share its pages through the OS page cache"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a quantized embedding file")
+        header_length = int.from_bytes(f.read(4), 'little')
+        header = json.loads(f.read(header_length).decode('utf-8'))
+
+    n_rows, n_dims = header['shape']
+    scales_offset = len(MAGIC) + 4 + header_length
+    scales_offset += -scales_offset % ALIGNMENT
+    scales = np.fromfile(path, dtype=np.float32, count=n_dims, offset=scales_offset)
+    codes_offset = scales_offset + n_dims * 4
+    codes_offset += -codes_offset % ALIGNMENT
+    if n_rows == 0:
+        codes = np.empty((0, n_dims), dtype=header['dtype'])
+    else:
+        codes = np.memmap(path, dtype=header['dtype'], mode='r', offset=codes_offset, shape=(n_rows, n_dims))
+    return codes, scales, header['metadata']
@@ -0,0 +1,118 @@
+import hashlib
+import logging
+import sqlite3
+import time
+
+import numpy as np
+
+from vector_index import BruteForceIndex
+
+# SQLite caps the number of bound parameters per statement
+_MAX_PARAMS = 500
+
+
+def text_sha256(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ResumeIndex:
+    """Persistent SQLite store of resume texts and embeddings for job -> resumes queries.
+
+    update() re-encodes only resumes whose text is new or changed. Opening the index
+    reads every embedding into an exact in-memory index; texts stay on disk and are
+    fetched only for the resumes a query shortlists, so no PDF is read at query time.
+    """
+
+    def __init__(self, path='resume_index.sqlite', embedding_name=None, max_memory_mb=256):
+        self.path = path
+        self.embedding_name = embedding_name
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.index = BruteForceIndex(max_memory_mb=max_memory_mb)
+        self.names = []
+        self.hashes = {}
+        self.create_schema()
+        self._load()
+
+    def create_schema(self):
+        with self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS resumes (name TEXT PRIMARY KEY, sha256 TEXT NOT NULL, '
+                'text TEXT NOT NULL, embedding BLOB NOT NULL)'
+            )
+            self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'embedding_name'").fetchone()
+            if row and self.embedding_name and row[0] != self.embedding_name:
+                # Vectors from another model or encoding mode are not comparable
+                logging.warning(f"Resume index {self.path} was built with {row[0]}; rebuilding for {self.embedding_name}")
+                self.conn.execute('DELETE FROM resumes')
+            if self.embedding_name:
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('embedding_name', ?)", (self.embedding_name,))
+
+    def _load(self):
+        """Read every embedding into the in-memory index, in name order"""
+        start = time.perf_counter()
+        rows = self.conn.execute('SELECT name, sha256, embedding FROM resumes ORDER BY name').fetchall()
+        self.names = [name for name, _, _ in rows]
+        self.hashes = {name: sha256 for name, sha256, _ in rows}
+        self.index = BruteForceIndex(max_memory_mb=self.index.max_memory_mb)
+        if rows:
+            self.index.add(np.frombuffer(b''.join(blob for _, _, blob in rows), dtype=np.float32).reshape(len(rows), -1))
+        logging.info(f"Loaded {len(rows)} resume embeddings from {self.path} in {time.perf_counter() - start:.2f}s")
+
+    def __len__(self):
+        return len(self.names)
+
+    def update(self, resumes, encode_fn, prune=False):
+        """Add or refresh {name: text} resumes, encoding only new or edited texts in one call.
+
+        With prune, resumes missing from `resumes` are removed. Returns
+        {'added': n, 'updated': n, 'removed': n}.
+        """
+        changed = {name: text for name, text in resumes.items() if self.hashes.get(name) != text_sha256(text)}
+        removed = [name for name in self.hashes if name not in resumes] if prune else []
+        if not changed and not removed:
+            return {'added': 0, 'updated': 0, 'removed': 0}
+
+        stats = {
+            'added': sum(1 for name in changed if name not in self.hashes),
+            'updated': sum(1 for name in changed if name in self.hashes),
+            'removed': len(removed),
+        }
+        embeddings = np.asarray(encode_fn(list(changed.values())), dtype=np.float32) if changed else []
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO resumes (name, sha256, text, embedding) VALUES (?, ?, ?, ?)',
+                [(name, text_sha256(text), text, embedding.tobytes())
+                 for (name, text), embedding in zip(changed.items(), embeddings)]
+            )
+            self.conn.executemany('DELETE FROM resumes WHERE name = ?', [(name,) for name in removed])
+        self._load()
+        logging.info(
+            f"Resume index: {stats['added']} added, {stats['updated']} re-encoded, {stats['removed']} removed"
+        )
+        return stats
+
+    def remove(self, names):
+        """Drop resumes by name"""
+        with self.conn:
+            self.conn.executemany('DELETE FROM resumes WHERE name = ?', [(name,) for name in names])
+        self._load()
+
+    def texts(self, names):
+        """{name: text} for the given resume names"""
+        names = list(dict.fromkeys(names))
+        texts = {}
+        for start in range(0, len(names), _MAX_PARAMS):
+            batch = names[start:start + _MAX_PARAMS]
+            texts.update(self.conn.execute(
+                f"SELECT name, text FROM resumes WHERE name IN ({', '.join('?' * len(batch))})", batch
+            ).fetchall())
+        return texts
+
+    def search(self, queries, k):
+        """(scores, resume names) of the k most similar resumes for each query embedding, best first"""
+        scores, rows = self.index.search(queries, k)
+        return scores, [[self.names[row] for row in query_rows] for query_rows in rows]
+
+    def close(self):
+        self.conn.close()
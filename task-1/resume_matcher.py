@@ -1,164 +1,300 @@
-import pandas as pd
-import pdfplumber
 import os
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from pathlib import Path
 import logging
 import json
+import argparse
+import hashlib
+import instrumentation
+from lazy_imports import LazyModule
+from embedding_cache import EmbeddingCache
+from encoding_pipeline import EncodingPipeline
+from pdf_extraction import TextCache, extract_pdf_text, extract_texts
+from resume_watcher import ResumeWatcher
+from vector_index import create_index, load_index, normalize_rows, quantization_report, recall_report
+from skill_matcher import SkillVocabulary
+from job_catalog import (
+    JobCatalog, ParaformCSVAdapter, SRNJobsAdapter, combined_text, parse_salary_range, parse_yoe_range, workplace_type
+)
+from job_filters import JobFilter
+from resume_index import ResumeIndex
+from bm25_index import BM25Index, fuse_scores
+
+# Heavy dependencies are imported on first use so cached runs and helpers start fast
+pd = LazyModule('pandas')
+sentence_transformers = LazyModule('sentence_transformers')
+pairwise = LazyModule('sklearn.metrics.pairwise')
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Catalog columns the matcher reads
+MATCH_COLUMNS = [
+    'source', 'Company', 'Role', 'Locations', 'Workplace', 'Tech Stack', 'One liner', 'Requirements',
+    'Industry', 'YOE', 'Equity', 'Visa', 'Team Size', 'Funding', 'Min Salary', 'Max Salary', 'Min YOE', 'Max YOE',
+    'Workplace Type', 'combined_text'
+]
+
 class ResumeJobMatcher:
-    def __init__(self):
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, cache_dir='.embedding_cache', max_cached_embeddings=100000,
+                 text_cache_path='.text_cache.json', index_kind='exact', index_params=None,
+                 index_path=None, tech_weight=0.0, catalog_path='job_catalog.sqlite',
+                 chunked_encoding=False, chunk_overlap=32, resume_index_path=None, retrieval='dense',
+                 bm25_candidates=200, fusion='rrf', fusion_weight=0.5, bm25_query_terms=128):
+        self.model_name = MODEL_NAME
+        self._model = None
+        # chunked_encoding splits texts past the model's token limit instead of truncating them
+        self.chunked_encoding = chunked_encoding
+        self.chunk_overlap = chunk_overlap
+        self._encoder = None
+        # Identifies how embeddings were produced, for the embedding cache and saved indexes
+        self.embedding_name = (
+            f"{self.model_name}-chunked-{chunk_overlap}" if chunked_encoding else self.model_name
+        )
         self.jobs_df = None
+        # Normalized jobs from every source; pass catalog_path=None to keep it in memory
+        self.catalog = JobCatalog(catalog_path or ':memory:')
+        self.job_embeddings = None
+        # Vector index over job embeddings ('exact' or 'ivf'); saved to index_path when set
+        self.index = None
+        self.index_kind = index_kind
+        self.index_params = index_params or {}
+        self.index_path = index_path
+        # Skill vocabulary from all job tech stacks; tech_weight blends tech overlap into the score
+        self.skill_vocab = None
+        self.job_skill_matrix = None
+        self.tech_weight = tech_weight
+        # 'dense' searches the vector index; 'hybrid' reranks the BM25 index's top bm25_candidates
+        # jobs by embedding and fuses both scores; 'keyword' ranks by BM25 alone and never encodes
+        self.retrieval = retrieval
+        self.bm25_candidates = bm25_candidates
+        self.fusion = fusion
+        self.fusion_weight = fusion_weight
+        # Resume queries keep only their rarest terms, which bounds the postings read per query
+        self.bm25_query_terms = bm25_query_terms
+        self.lexical_index = None
         self.resumes = {}
         self.resume_dir = Path('resumes')
+        # Job embeddings are reused across runs; pass cache_dir=None to always re-encode
+        self.embedding_cache = (
+            EmbeddingCache(cache_dir, self.embedding_name, max_entries=max_cached_embeddings)
+            if cache_dir else None
+        )
+        # Extracted resume text is reused until a PDF's size, mtime or content changes
+        self.text_cache = TextCache(text_cache_path) if text_cache_path else None
+        # Embeddings of every loaded resume, kept for job -> resumes shortlists
+        self.resume_index = ResumeIndex(resume_index_path, self.embedding_name) if resume_index_path else None
         
+    @property
+    def model(self):
+        """SentenceTransformer, loaded on first use (never, when every embedding is cached)"""
+        if self._model is None:
+            logging.info(f"Loading {self.model_name}")
+            self._model = sentence_transformers.SentenceTransformer(self.model_name)
+        return self._model
+
+    @property
+    def encoder(self):
+        """Length-bucketed chunking pipeline used when chunked_encoding is set"""
+        if self._encoder is None:
+            self._encoder = EncodingPipeline(self.model, overlap=self.chunk_overlap)
+        return self._encoder
+
+    @instrumentation.timed('matcher.encode')
+    def encode_texts(self, texts, batch_size=64):
+        """Embeddings for any texts, chunking long ones when chunked_encoding is set"""
+        texts = list(texts)
+        instrumentation.count('matcher.texts_encoded', len(texts))
+        if self.chunked_encoding:
+            return self.encoder.encode(texts)
+        return self.model.encode(texts, batch_size=batch_size)
+
     def parse_salary(self, salary_str):
         """Parse salary string to min and max values, handling equity and special cases"""
-        try:
-            # Remove $ and , from the string
-            salary = salary_str.replace('$', '').replace(',', '')
-            
-            # Handle equity or additional compensation
-            if '+' in salary and 'equity' in salary.lower():
-                salary = salary.split('+')[0].strip()
-                
-            # Check if it's a range
-            if '-' in salary:
-                min_sal, max_sal = salary.split('-')
-                return {
-                    'Min Salary': float(min_sal.strip()),
-                    'Max Salary': float(max_sal.strip())
-                }
-            else:
-                # Single number (base salary)
-                base = float(salary.split()[0].strip())
-                return {
-                    'Min Salary': base,
-                    'Max Salary': base
-                }
-        except:
+        min_salary, max_salary = parse_salary_range(salary_str)
+        if min_salary is None:
             return {}
-            
-    def load_jobs(self, paraform_csv_path):
-        """Load jobs from both Paraform CSV and scraped SRN data"""
-        jobs_data = []
-        
-        # Load Paraform jobs
-        try:
-            paraform_df = pd.read_csv(paraform_csv_path)
-            paraform_df['source'] = 'Paraform'
-            jobs_data.append(paraform_df)
-            logging.info(f"Loaded {len(paraform_df)} jobs from Paraform CSV")
-        except Exception as e:
-            logging.error(f"Error loading Paraform jobs: {e}")
-        
-        # Load scraped SRN jobs
-        try:
-            with open('srn_jobs.json', 'r') as f:
-                srn_data = json.load(f)
-                srn_jobs = srn_data['jobs']
-                # Convert SRN job structure to match Paraform
-                for job in srn_jobs:
-                    # Map basic fields
-                    job['Role'] = job.pop('title', '')
-                    job['Company'] = job.pop('company', '')
-                    job['Locations'] = job.pop('location', '')
-                    
-                    # Extract and standardize salary data
-                    if 'salary' in job:
-                        salary_data = self.parse_salary(job.pop('salary'))
-                        job.update(salary_data)
-                    
-                    # Map and standardize other fields
-                    job['Workplace'] = job.pop('workplace', '')
-                    job['Tech Stack'] = job.get('Tech Stack', '')
-                    job['One liner'] = job.get('One liner', '')
-                    job['Equity'] = job.get('Equity', 'Not specified')
-                    job['Visa'] = job.get('Visa', 'Contact company')
-                    job['YOE'] = job.get('YOE', 'Not specified')
-                    job['Team Size'] = job.get('Team Size', 'Not specified')
-                    job['Funding'] = job.get('Funding', 'Not specified')
-                    job['Requirements'] = job.get('Requirements', '')
-                    job['Industry'] = job.get('Industry', 'Tech')
-                    
-                srn_df = pd.DataFrame(srn_jobs)
-                srn_df['source'] = 'SRN'
-                jobs_data.append(srn_df)
-                logging.info(f"Loaded {len(srn_df)} jobs from SRN")
-        except Exception as e:
-            logging.error(f"Error loading SRN jobs: {e}")
+        return {'Min Salary': min_salary, 'Max Salary': max_salary}
+
+    @instrumentation.timed('matcher.load_jobs')
+    def load_jobs(self, paraform_csv_path, srn_jobs_path='srn_jobs.jsonl', embed=True):
+        """Load jobs from both Paraform CSV and scraped SRN data via the job catalog.
+
+        With embed=False jobs are not encoded and can only be searched by keyword.
+        """
+        loaded_sources = []
+        for adapter in (ParaformCSVAdapter(paraform_csv_path), SRNJobsAdapter(srn_jobs_path)):
+            try:
+                self.catalog.sync(adapter)
+                loaded_sources.append(adapter.name)
+            except Exception as e:
+                logging.error(f"Error loading {adapter.name} jobs: {e}")
+
+        self.jobs_df = self.catalog.read(loaded_sources, columns=MATCH_COLUMNS)
+        instrumentation.count('matcher.jobs_loaded', len(self.jobs_df))
+        for source, count in self.jobs_df['source'].value_counts(sort=False).items():
+            logging.info(f"Loaded {count} jobs from {source}")
         
         # Combine all jobs
-        if jobs_data:
-            self.jobs_df = pd.concat(jobs_data, ignore_index=True)
-            
-            # Create combined text for matching - using all relevant fields
-            self.jobs_df['combined_text'] = self.jobs_df.apply(
-                lambda x: f"{x.get('Role', '')} {x.get('Tech Stack', '')} {x.get('One liner', '')} "
-                         f"{x.get('Requirements', '')} {x.get('Industry', '')} {x.get('Workplace', '')} "
-                         f"{x.get('YOE', '')}",
-                axis=1
-            )
-            
-            # Generate embeddings for matching
-            self.job_embeddings = self.model.encode(self.jobs_df['combined_text'].tolist())
+        if len(self.jobs_df):
+            self.skill_vocab = SkillVocabulary.from_tech_stacks(self.jobs_df['Tech Stack'])
+            self.job_skill_matrix = self.skill_vocab.job_matrix(self.jobs_df['Tech Stack'])
+            logging.info(f"Built skill vocabulary of {len(self.skill_vocab)} technologies")
+
+            if self.retrieval != 'dense' or not embed:
+                self.build_lexical_index()
+            if embed:
+                # Generate embeddings for matching, re-encoding only new or edited jobs
+                self.job_embeddings = self.encode_jobs(self.jobs_df['combined_text'].tolist())
+                self.build_index()
+            else:
+                self.job_embeddings = self.index = None
             logging.info(f"Successfully processed {len(self.jobs_df)} total jobs")
         else:
             raise Exception("No jobs could be loaded from any source")
             
+    def encode_jobs(self, job_texts):
+        """Encode job texts, going through the embedding cache when enabled"""
+        if self.embedding_cache is None:
+            return self.encode_texts(job_texts)
+
+        hits, misses = self.embedding_cache.hits, self.embedding_cache.misses
+        # encode_texts resolves self.model only on a cache miss, so a fully cached run never loads it
+        embeddings = self.embedding_cache.get_or_encode(job_texts, self.encode_texts)
+        logging.info(
+            f"Job embedding cache: {self.embedding_cache.hits - hits} hits, "
+            f"{self.embedding_cache.misses - misses} misses"
+        )
+        return embeddings
+
+    def build_index(self):
+        """Build the job vector index, reusing the saved one if it was built from the same jobs"""
+        fingerprint = hashlib.sha256(
+            '\0'.join([self.embedding_name] + self.jobs_df['combined_text'].tolist()).encode('utf-8')
+        ).hexdigest()
+
+        if self.index_path and Path(self.index_path).exists():
+            try:
+                index, metadata = load_index(self.index_path)
+                # Unset (None) params keep the saved index's values; n_lists is fixed by its training
+                params = {key: value for key, value in self.index_params.items() if value is not None}
+                n_lists = params.pop('n_lists', None)
+                if (index.kind == self.index_kind and str(metadata.get('fingerprint')) == fingerprint
+                        and (n_lists is None or n_lists == index.n_lists)):
+                    for key, value in params.items():
+                        setattr(index, key, value)
+                    self.index = index
+                    logging.info(f"Loaded {index.kind} job index from {self.index_path}")
+                    return
+            except Exception as e:
+                logging.warning(f"Could not load job index {self.index_path}: {e}")
+
+        self.index = create_index(self.index_kind, **self.index_params)
+        self.index.add(self.job_embeddings)
+        logging.info(f"Built {self.index.kind} index over {len(self.index)} jobs")
+        if self.index_path:
+            self.index.save(self.index_path, fingerprint=fingerprint)
+
+    @instrumentation.timed('matcher.build_lexical_index')
+    def build_lexical_index(self):
+        """BM25 index over the jobs' combined text; document ids are jobs_df positions"""
+        self.lexical_index = BM25Index()
+        self.lexical_index.add(self.jobs_df['combined_text'].tolist())
+        stats = self.lexical_index.stats()
+        logging.info(
+            f"Built BM25 index over {stats['documents']} jobs: {stats['terms']} terms, "
+            f"{stats['postings']} postings ({stats['bytes'] / 1e6:.1f} MB)"
+        )
+
+    def require_job_embeddings(self, feature):
+        if self.job_embeddings is None:
+            raise ValueError(f"{feature} needs job embeddings; load jobs with embed=True")
+
+    @property
+    def retrieval_mode(self):
+        """The retrieval actually used: jobs loaded with embed=False can only be searched by keyword"""
+        return self.retrieval if self.job_embeddings is not None else 'keyword'
+
+    def index_recall_report(self, k=10, queries=None):
+        """Recall of the job index against exact search, using the loaded resumes as queries by default"""
+        self.require_job_embeddings('The recall report')
+        if queries is None:
+            queries = self.encode_resumes(self.resumes.values())
+        # Compare against float32 search over the original embeddings (a quantized index only keeps codes)
+        exact = create_index('exact')
+        exact.add(self.job_embeddings)
+        return recall_report(self.index, queries, k=k, exact=exact)
+
+    def encode_resumes(self, resume_texts, batch_size=64):
+        """Encode many resumes in a single batched call"""
+        return self.encode_texts(resume_texts, batch_size=batch_size)
+
     def extract_text_from_pdf(self, pdf_path):
         """Extract text content from PDF"""
-        try:
-            text = ""
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-            return text
-        except Exception as e:
-            logging.error(f"Error extracting text from PDF {pdf_path}: {str(e)}")
-            return None
+        return extract_pdf_text(pdf_path)
     
-    def load_resumes(self):
-        """Load all resumes from the resumes directory"""
+    def load_resumes(self, workers=1, timeout=60):
+        """Load all resumes from the resumes directory
+
+        workers > 1 parses uncached PDFs in a process pool, skipping any file that
+        takes longer than timeout seconds.
+        """
         if not self.resume_dir.exists():
             logging.error(f"Resume directory {self.resume_dir} does not exist!")
             return False
             
+        pdf_paths = list(self.resume_dir.glob('*.pdf'))
+        try:
+            with instrumentation.span('matcher.pdf_extraction'):
+                texts = extract_texts(pdf_paths, workers=workers, timeout=timeout, cache=self.text_cache, prune=True)
+        except Exception as e:
+            logging.error(f"Error loading resumes from {self.resume_dir}: {str(e)}")
+            texts = {}
+
         resume_count = 0
-        for file_path in self.resume_dir.glob('*.pdf'):
-            try:
-                resume_text = self.extract_text_from_pdf(file_path)
-                if resume_text:
-                    self.resumes[file_path.name] = resume_text
-                    resume_count += 1
-                    logging.info(f"Successfully loaded resume: {file_path.name}")
-            except Exception as e:
-                logging.error(f"Error loading resume {file_path}: {str(e)}")
+        for file_path in pdf_paths:
+            resume_text = texts.get(file_path)
+            if resume_text:
+                self.resumes[file_path.name] = resume_text
+                resume_count += 1
+                logging.info(f"Successfully loaded resume: {file_path.name}")
                 
+        instrumentation.count('matcher.resumes_loaded', resume_count)
         if resume_count == 0:
             logging.warning("No resumes found in the resumes directory!")
             return False
             
         logging.info(f"Successfully loaded {resume_count} resumes")
+        if self.resume_index is not None:
+            self.resume_index.update(self.resumes, self.encode_resumes, prune=True)
         return True
                 
-    def calculate_match_score(self, resume_text, job_embedding):
+    def calculate_match_score(self, resume_text, job_embedding, resume_embedding=None):
         """Calculate match score between resume and job"""
-        resume_embedding = self.model.encode([resume_text])
-        similarity = cosine_similarity(resume_embedding, job_embedding.reshape(1, -1))[0][0]
+        if resume_embedding is None:
+            resume_embedding = self.encode_resumes([resume_text])
+        resume_embedding = np.asarray(resume_embedding).reshape(1, -1)
+        similarity = pairwise.cosine_similarity(resume_embedding, job_embedding.reshape(1, -1))[0][0]
         # Convert similarity to 1-10 scale
         return round(similarity * 10, 1)
     
-    def analyze_tech_stack_match(self, resume_text, job):
-        """Analyze how well the resume matches the job's tech stack"""
+    def analyze_tech_stack_match(self, resume_text, job, resume_skill_ids=None, skill_vocab=None):
+        """Analyze how well the resume matches the job's tech stack
+
+        resume_skill_ids, the resume's precomputed ids in skill_vocab (default: the
+        loaded jobs' vocabulary), avoids re-scanning the resume text for every technology.
+        """
         if pd.isna(job.get('Tech Stack')):
             return []
+
+        if resume_skill_ids is not None:
+            term_ids = (skill_vocab or self.skill_vocab).term_ids
+            return [
+                tech for tech in SkillVocabulary.split_tech_stack(job['Tech Stack'])
+                if term_ids.get(tech.lower()) in resume_skill_ids
+            ]
             
         tech_stack = job['Tech Stack'].split(', ')
         matches = []
@@ -168,70 +304,172 @@ class ResumeJobMatcher:
         return matches
     
     def analyze_experience_match(self, resume_text, job):
-        """Analyze years of experience match"""
+        """Describe the job's experience requirement from its parsed Min/Max YOE"""
         if pd.isna(job.get('YOE')):
             return None
-            
-        yoe_required = str(job['YOE'])
-        try:
-            if '+' in yoe_required:
-                min_years = float(yoe_required.replace('years', '').replace('year', '').replace('+', '').strip())
-                return f"Requires {min_years}+ years of experience"
-            elif '-' in yoe_required:
-                years_range = [float(y.replace('years', '').replace('year', '').strip()) 
-                             for y in yoe_required.split('-')]
-                return f"Requires {years_range[0]}-{years_range[1]} years of experience"
-            else:
-                years = float(yoe_required.replace('years', '').replace('year', '').strip())
-                return f"Requires {years} years of experience"
-        except (ValueError, IndexError):
-            return f"Experience requirement: {yoe_required}"
+
+        min_years, max_years = job.get('Min YOE'), job.get('Max YOE')
+        if pd.isna(min_years):
+            return f"Experience requirement: {job['YOE']}"
+        if pd.isna(max_years):
+            return f"Requires {min_years}+ years of experience"
+        if min_years != max_years:
+            return f"Requires {min_years}-{max_years} years of experience"
+        return f"Requires {min_years} years of experience"
     
-    def find_top_matches(self, resume_text, n=2):
-        """Find top n job matches for a resume"""
-        resume_embedding = self.model.encode([resume_text])
-        similarities = cosine_similarity(resume_embedding, self.job_embeddings)[0]
-        top_indices = similarities.argsort()[-n:][::-1]
-        
-        matches = []
-        for idx in top_indices:
-            job = self.jobs_df.iloc[idx]
-            score = round(similarities[idx] * 10, 1)
-            tech_matches = self.analyze_tech_stack_match(resume_text, job)
-            exp_requirement = self.analyze_experience_match(resume_text, job)
-            
-            # Format salary range with proper handling of missing/invalid values
-            min_salary = job.get('Min Salary')
-            max_salary = job.get('Max Salary')
-            if pd.isna(min_salary) or pd.isna(max_salary):
-                salary_range = "Salary not specified"
+    def job_mask(self, job_filter):
+        """Boolean mask over jobs_df from a JobFilter (or an existing mask); None when nothing is filtered"""
+        if job_filter is None:
+            return None
+        if isinstance(job_filter, JobFilter):
+            if job_filter.is_empty():
+                return None
+            mask = job_filter.mask(self.jobs_df)
+            logging.info(f"{job_filter} kept {int(mask.sum())} of {len(mask)} jobs")
+            return mask
+        return np.asarray(job_filter, dtype=bool)
+
+    @instrumentation.timed('matcher.find_top_matches')
+    def find_top_matches(self, resume_text, n=2, resume_embedding=None, job_filter=None):
+        """Find top n job matches for a resume; job_filter (a JobFilter or boolean mask) limits which jobs are scored"""
+        if self.retrieval_mode == 'keyword':
+            resume_embedding = None
+        else:
+            if resume_embedding is None:
+                resume_embedding = self.encode_resumes([resume_text])
+            resume_embedding = np.asarray(resume_embedding).reshape(1, -1)
+        scores, indices, overlap, resume_skills = self.rank_jobs(
+            [resume_text], resume_embedding, n, mask=self.job_mask(job_filter)
+        )
+        skill_ids = set(resume_skills.indices)
+        return [
+            self.build_match(resume_text, idx, score, tech_overlap, skill_ids)
+            for idx, score, tech_overlap in zip(indices[0], scores[0], overlap[0]) if idx >= 0
+        ]
+
+    @instrumentation.timed('matcher.similarity')
+    def rank_jobs(self, resume_texts, resume_embeddings, n, mask=None):
+        """Top n jobs per resume as (scores, job indices, tech overlap, resume skill matrix).
+
+        The score is the embedding similarity, blended with the share of the job's
+        tech stack found in the resume when tech_weight is set; in that case a wider
+        candidate set is pulled from the index and re-ranked. Only jobs selected by
+        mask are scored. In hybrid and keyword retrieval the candidates come from the
+        BM25 index instead (see lexical_search); resume_embeddings may be None for keyword.
+        """
+        instrumentation.count('matcher.resumes_ranked', len(resume_texts))
+        resume_skills = self.skill_vocab.text_matrix(resume_texts)
+        k = max(n * 10, 50) if self.tech_weight else n
+        if self.retrieval_mode == 'dense':
+            scores, indices = self.index.search(resume_embeddings, k, mask=mask)
+        else:
+            scores, indices = self.lexical_search(
+                resume_texts, resume_embeddings if self.retrieval_mode == 'hybrid' else None, k, mask=mask
+            )
+
+        valid = indices >= 0
+        job_rows = np.where(valid, indices, 0)
+        resume_rows = np.repeat(np.arange(len(resume_texts)), job_rows.shape[1])
+        overlap = SkillVocabulary.pair_overlap(
+            resume_skills, self.job_skill_matrix, resume_rows, job_rows
+        ).reshape(job_rows.shape)
+
+        if self.tech_weight:
+            blended = (1 - self.tech_weight) * scores + self.tech_weight * overlap
+            scores = np.where(valid, blended, -np.inf)
+            order = np.argsort(-scores, axis=1, kind='stable')[:, :n]
+            scores = np.take_along_axis(scores, order, axis=1)
+            indices = np.take_along_axis(indices, order, axis=1)
+            overlap = np.take_along_axis(overlap, order, axis=1)
+        return scores, indices, overlap, resume_skills
+
+    @instrumentation.timed('matcher.lexical_search')
+    def lexical_search(self, resume_texts, resume_embeddings, k, mask=None):
+        """(scores, job indices) of the top k jobs per resume from the BM25 index, padded with -1.
+
+        Without embeddings the score is BM25 relative to the resume's best job. With
+        them, the top bm25_candidates jobs are re-scored by cosine similarity and the
+        two scores fused as self.fusion asks; a resume sharing no terms with any job
+        falls back to the vector index.
+        """
+        top_scores = np.full((len(resume_texts), k), -np.inf, dtype=np.float32)
+        top_indices = np.full((len(resume_texts), k), -1, dtype=np.int64)
+        depth = k if resume_embeddings is None else max(k, self.bm25_candidates)
+        for row, resume_text in enumerate(resume_texts):
+            scores, indices = self.lexical_index.search(
+                resume_text, depth, mask=mask, max_query_terms=self.bm25_query_terms
+            )
+            instrumentation.count('matcher.bm25_candidates', len(indices))
+            if resume_embeddings is None:
+                scores = scores / scores[0] if len(scores) else scores
+            elif not len(indices):
+                scores, indices = self.index.search(resume_embeddings[row:row + 1], k, mask=mask)
+                scores, indices = scores[0], indices[0]
             else:
-                try:
-                    salary_range = f"${int(min_salary):,} - ${int(max_salary):,}"
-                except (ValueError, TypeError):
-                    salary_range = "Salary format error"
-
-            matches.append({
-                'company': job['Company'],
-                'role': job['Role'],
-                'score': score,
-                'tech_matches': tech_matches,
-                'experience_req': exp_requirement,
-                'location': job.get('Locations', 'Not specified'),
-                'workplace': job.get('Workplace', 'Not specified'),
-                'source': job.get('source', 'Unknown'),
-                'tech_stack': job.get('Tech Stack', ''),
-                'one_liner': job.get('One liner', ''),
-                'salary_range': salary_range,
-                'equity': job.get('Equity', 'Not specified'),
-                'visa': job.get('Visa', 'Contact company'),
-                'team_size': job.get('Team Size', 'Not specified'),
-                'funding': job.get('Funding', 'Not specified'),
-                'industry': job.get('Industry', 'Tech'),
-                'requirements': job.get('Requirements', ''),
-                'justification': self.generate_justification(resume_text, job, tech_matches, exp_requirement)
-            })
-        return matches
+                query = normalize_rows(np.asarray(resume_embeddings[row:row + 1], dtype=np.float32))[0]
+                dense = normalize_rows(np.asarray(self.job_embeddings[indices], dtype=np.float32)) @ query
+                scores = fuse_scores(dense, scores, self.fusion, self.fusion_weight)
+                order = np.argsort(-scores, kind='stable')[:k]
+                scores, indices = scores[order], indices[order]
+            top_scores[row, :len(scores[:k])] = scores[:k]
+            top_indices[row, :len(indices[:k])] = indices[:k]
+        return top_scores, top_indices
+
+    def search_jobs(self, query, n=10, job_filter=None):
+        """Top n jobs for a keyword query such as 'rust kubernetes', by BM25 alone; never loads the model"""
+        if self.lexical_index is None:
+            self.build_lexical_index()
+        scores, indices = self.lexical_search([query], None, n, mask=self.job_mask(job_filter))
+        skill_ids = set(self.skill_vocab.text_matrix([query]).indices)
+        return [
+            self.build_match(query, idx, score, resume_skill_ids=skill_ids)
+            for idx, score in zip(indices[0], scores[0]) if idx >= 0
+        ]
+
+    def build_match(self, resume_text, job_idx, similarity, tech_overlap=None, resume_skill_ids=None):
+        """Build the match record for one resume and the job at position job_idx"""
+        return self.describe_match(resume_text, self.jobs_df.iloc[job_idx], similarity, tech_overlap, resume_skill_ids)
+
+    @instrumentation.timed('matcher.build_match')
+    def describe_match(self, resume_text, job, similarity, tech_overlap=None, resume_skill_ids=None,
+                       skill_vocab=None):
+        """Match record for one resume and one job row; skill_vocab is the vocabulary of resume_skill_ids"""
+        score = round(float(similarity) * 10, 1)
+        tech_matches = self.analyze_tech_stack_match(resume_text, job, resume_skill_ids, skill_vocab)
+        exp_requirement = self.analyze_experience_match(resume_text, job)
+        
+        # Format salary range with proper handling of missing/invalid values
+        min_salary = job.get('Min Salary')
+        max_salary = job.get('Max Salary')
+        if pd.isna(min_salary) or pd.isna(max_salary):
+            salary_range = "Salary not specified"
+        else:
+            try:
+                salary_range = f"${int(min_salary):,} - ${int(max_salary):,}"
+            except (ValueError, TypeError):
+                salary_range = "Salary format error"
+
+        return {
+            'company': job['Company'],
+            'role': job['Role'],
+            'score': score,
+            'tech_matches': tech_matches,
+            'tech_overlap': None if tech_overlap is None else round(float(tech_overlap), 2),
+            'experience_req': exp_requirement,
+            'location': job.get('Locations', 'Not specified'),
+            'workplace': job.get('Workplace', 'Not specified'),
+            'source': job.get('source', 'Unknown'),
+            'tech_stack': job.get('Tech Stack', ''),
+            'one_liner': job.get('One liner', ''),
+            'salary_range': salary_range,
+            'equity': job.get('Equity', 'Not specified'),
+            'visa': job.get('Visa', 'Contact company'),
+            'team_size': job.get('Team Size', 'Not specified'),
+            'funding': job.get('Funding', 'Not specified'),
+            'industry': job.get('Industry', 'Tech'),
+            'requirements': job.get('Requirements', ''),
+            'justification': self.generate_justification(resume_text, job, tech_matches, exp_requirement)
+        }
     
     def generate_justification(self, resume_text, job, tech_matches, exp_requirement):
         """Generate a detailed justification for the match"""
@@ -254,21 +492,129 @@ class ResumeJobMatcher:
             
         return " | ".join(justification_points)
     
-    def match_all_resumes(self):
-        """Match all loaded resumes to jobs"""
+    @instrumentation.timed('matcher.match_all_resumes')
+    def match_all_resumes(self, n=2, batched=False, max_memory_mb=None, job_filter=None):
+        """Match all loaded resumes to the jobs passing job_filter (default: all jobs)"""
         if not self.resumes:
             logging.error("No resumes loaded! Please add PDF resumes to the 'resumes' folder.")
             return []
-            
+
+        if batched:
+            return self.match_all_resumes_batched(n=n, max_memory_mb=max_memory_mb, job_filter=job_filter)
+
+        mask = self.job_mask(job_filter)
         results = []
         for resume_name, resume_text in self.resumes.items():
-            matches = self.find_top_matches(resume_text)
+            matches = self.find_top_matches(resume_text, n=n, job_filter=mask)
             results.append({
                 'resume_name': resume_name,
                 'matches': matches
             })
         return results
 
+    def match_all_resumes_batched(self, n=2, max_memory_mb=None, job_filter=None):
+        """Match all loaded resumes with one encoder call and a chunked resumes x jobs matrix product"""
+        resume_names = list(self.resumes)
+        resume_texts = [self.resumes[name] for name in resume_names]
+
+        if max_memory_mb is not None and self.index is not None and self.index.kind == 'exact':
+            self.index.max_memory_mb = max_memory_mb
+        resume_embeddings = (
+            None if self.retrieval_mode == 'keyword' else normalize_rows(self.encode_resumes(resume_texts))
+        )
+        top_scores, top_indices, overlap, resume_skills = self.rank_jobs(
+            resume_texts, resume_embeddings, n, mask=self.job_mask(job_filter)
+        )
+        logging.info(f"Scored {len(resume_names)} resumes against {len(self.jobs_df)} jobs in batch")
+
+        results = []
+        for row, resume_name in enumerate(resume_names):
+            skill_ids = set(resume_skills.indices[resume_skills.indptr[row]:resume_skills.indptr[row + 1]])
+            results.append({
+                'resume_name': resume_name,
+                'matches': [
+                    self.build_match(resume_texts[row], idx, score, tech_overlap, skill_ids)
+                    for idx, score, tech_overlap in zip(top_indices[row], top_scores[row], overlap[row])
+                    if idx >= 0
+                ]
+            })
+        return results
+
+    def job_row(self, job):
+        """A job as a jobs_df row: given as its position in jobs_df, or as a dict of Paraform-style fields"""
+        if isinstance(job, (int, np.integer)):
+            return self.jobs_df.iloc[job]
+        job = dict(job)
+        job.setdefault('source', 'Query')
+        if 'Min Salary' not in job:
+            job['Min Salary'], job['Max Salary'] = parse_salary_range(job.get('Salary'))
+        if 'Min YOE' not in job:
+            job['Min YOE'], job['Max YOE'] = parse_yoe_range(job.get('YOE'))
+        job.setdefault('Workplace Type', workplace_type(job.get('Workplace'), job.get('Locations')))
+        job.setdefault('combined_text', combined_text(job))
+        return pd.Series(job)
+
+    @instrumentation.timed('matcher.shortlist_resumes')
+    def shortlist_resumes(self, jobs=None, k=50):
+        """Top k resumes from the resume index for each job, scored and justified like find_top_matches.
+
+        jobs are positions in jobs_df or dicts of job fields (default: every loaded job).
+        All jobs are encoded and searched in one batch; only the shortlisted resumes'
+        texts are read back from the index. Returns one {'company', 'role', 'shortlist'}
+        per job, where each shortlist entry is a match record plus 'resume_name'.
+        """
+        if self.resume_index is None:
+            raise ValueError("Shortlisting needs a resume index; pass resume_index_path")
+        jobs = list(range(len(self.jobs_df)) if jobs is None else jobs)
+        if not jobs:
+            return []
+        job_rows = [self.job_row(job) for job in jobs]
+        if any(isinstance(job, (int, np.integer)) for job in jobs):
+            self.require_job_embeddings('Shortlisting loaded jobs')
+
+        # Loaded jobs reuse their embeddings; only ad-hoc jobs are encoded, bypassing the job
+        # embedding cache so one-off queries neither grow it nor trigger a rewrite
+        new_jobs = [i for i, job in enumerate(jobs) if not isinstance(job, (int, np.integer))]
+        encoded = iter(self.encode_texts([job_rows[i]['combined_text'] for i in new_jobs]) if new_jobs else ())
+        job_embeddings = np.vstack([
+            next(encoded) if not isinstance(job, (int, np.integer)) else self.job_embeddings[job] for job in jobs
+        ])
+
+        k_search = max(k * 10, 50) if self.tech_weight else k
+        scores, names = self.resume_index.search(job_embeddings, k_search)
+        texts = self.resume_index.texts(name for row in names for name in row)
+
+        # Skills are matched against the queried jobs' own stacks, which may list technologies no loaded job does
+        skill_vocab = SkillVocabulary.from_tech_stacks(row.get('Tech Stack') for row in job_rows)
+        job_skills = skill_vocab.job_matrix([row.get('Tech Stack') for row in job_rows])
+        candidates = list(texts)
+        resume_skills = skill_vocab.text_matrix([texts[name] for name in candidates])
+        candidate_rows = {name: i for i, name in enumerate(candidates)}
+        resume_rows = np.array([[candidate_rows[name] for name in row] for row in names], dtype=np.int64)
+        resume_rows = resume_rows.reshape(len(jobs), -1)
+        overlap = SkillVocabulary.pair_overlap(
+            resume_skills, job_skills, resume_rows, np.repeat(np.arange(len(jobs)), resume_rows.shape[1])
+        ).reshape(resume_rows.shape)
+
+        if self.tech_weight:
+            scores = (1 - self.tech_weight) * scores + self.tech_weight * overlap
+            order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+            scores = np.take_along_axis(scores, order, axis=1)
+            resume_rows = np.take_along_axis(resume_rows, order, axis=1)
+            overlap = np.take_along_axis(overlap, order, axis=1)
+
+        results = []
+        for job_pos, job in enumerate(job_rows):
+            shortlist = []
+            for row, score, tech_overlap in zip(resume_rows[job_pos], scores[job_pos], overlap[job_pos]):
+                name = candidates[row]
+                skill_ids = set(resume_skills.indices[resume_skills.indptr[row]:resume_skills.indptr[row + 1]])
+                match = self.describe_match(texts[name], job, score, tech_overlap, skill_ids, skill_vocab)
+                shortlist.append({'resume_name': name, **match})
+            results.append({'company': job['Company'], 'role': job['Role'], 'shortlist': shortlist})
+        instrumentation.count('matcher.jobs_shortlisted', len(jobs))
+        return results
+
 def print_results(results):
     """Print results in a concise tabular format"""
     if not results:
@@ -310,17 +656,163 @@ def print_results(results):
             print(f"{company_role:<35} | {source:<8} | {score:<5} | {justification}")
         print("-" * 120)
 
+def print_shortlists(shortlists):
+    """Print the top resumes for each job"""
+    for result in shortlists:
+        print(f"\n{result['company']}: {result['role']}")
+        print("-" * 120)
+        for rank, match in enumerate(result['shortlist'], 1):
+            tech_matches = f"Matches: {', '.join(match['tech_matches'])[:60]}" if match['tech_matches'] else ""
+            print(f"{rank:>3}. {match['resume_name'][:40]:<40} | {match['score']:<5} | {tech_matches}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Match resumes against Paraform and SRN jobs")
+    parser.add_argument('--batched', action='store_true',
+                        help="Encode all resumes at once and score them with chunked matrix products")
+    parser.add_argument('--max-memory-mb', type=float, default=256,
+                        help="Memory budget for each block of the batched score matrix")
+    parser.add_argument('--top-n', type=int, default=2, help="Number of job matches per resume")
+    parser.add_argument('--tech-weight', type=float, default=0.0,
+                        help="Weight (0-1) of tech stack overlap blended into the embedding score")
+    parser.add_argument('--index', choices=['exact', 'ivf', 'float16', 'int8'], default='exact',
+                        help="Job vector index: exact brute force, approximate IVF, or exact search over "
+                             "float16/int8 quantized embeddings (memory-mapped when saved with --index-path)")
+    parser.add_argument('--nprobe', type=int, default=8,
+                        help="IVF lists scanned per query; higher is slower with better recall")
+    parser.add_argument('--n-lists', type=int, default=None,
+                        help="IVF list count (default: square root of the job count)")
+    parser.add_argument('--index-path', default=None,
+                        help="Save the job index here (.npz) and reuse it while the jobs are unchanged")
+    parser.add_argument('--recall-report', action='store_true',
+                        help="Print recall@10 of the job index against exact search")
+    parser.add_argument('--quantization-report', action='store_true',
+                        help="Print top-10 overlap and memory of float16 and int8 job embeddings against float32")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes used to extract text from uncached PDFs")
+    parser.add_argument('--pdf-timeout', type=float, default=60,
+                        help="Seconds before a single PDF is skipped (with --workers > 1)")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and match resumes as they are added, changed or deleted")
+    parser.add_argument('--watch-interval', type=float, default=0.25,
+                        help="Seconds between polls of the resumes directory in watch mode")
+    parser.add_argument('--results-path', default='match_results.json',
+                        help="File the watch mode keeps up to date with the current matches")
+    parser.add_argument('--chunked-encoding', action='store_true',
+                        help="Split texts longer than the model's token limit into overlapping chunks and average them")
+    parser.add_argument('--chunk-overlap', type=int, default=32,
+                        help="Tokens shared by consecutive chunks with --chunked-encoding")
+    parser.add_argument('--retrieval', choices=['dense', 'hybrid', 'keyword'], default='dense',
+                        help="First-stage retrieval: the vector index, BM25 candidates reranked by embedding, "
+                             "or BM25 alone (never loads the model)")
+    parser.add_argument('--bm25-candidates', type=int, default=200,
+                        help="Jobs taken from the BM25 index per resume for hybrid retrieval to rerank")
+    parser.add_argument('--fusion', choices=['rrf', 'linear', 'rerank'], default='rrf',
+                        help="How hybrid retrieval combines BM25 and embedding scores")
+    parser.add_argument('--fusion-weight', type=float, default=0.5,
+                        help="Weight of the embedding score (or ranking, for rrf) in hybrid retrieval")
+    parser.add_argument('--keyword-query', default=None,
+                        help="Print the top --top-n jobs for this keyword query instead of matching resumes")
+    parser.add_argument('--workplace', nargs='+', choices=['remote', 'hybrid', 'onsite'], default=None,
+                        help="Only match jobs with these workplace types")
+    parser.add_argument('--min-salary', type=float, default=None,
+                        help="Only match jobs whose salary range starts at or above this")
+    parser.add_argument('--max-yoe', type=float, default=None,
+                        help="Only match jobs asking for at most this many years of experience")
+    parser.add_argument('--location', nargs='+', default=None,
+                        help="Only match jobs whose locations mention one of these")
+    parser.add_argument('--needs-visa', action='store_true',
+                        help="Skip jobs that state they cannot sponsor visas")
+    parser.add_argument('--keep-unknown', action='store_true',
+                        help="Let jobs with a missing salary, YOE, workplace or location pass those filters")
+    parser.add_argument('--resume-index', default=None,
+                        help="SQLite file keeping every loaded resume's text and embedding for job shortlists")
+    parser.add_argument('--shortlist', type=int, default=None, metavar='K',
+                        help="Print the top K resumes from --resume-index for each job instead of jobs per resume")
+    parser.add_argument('--shortlist-jobs', type=int, nargs='+', default=None, metavar='POSITION',
+                        help="Positions of the loaded jobs to shortlist for (default: every job)")
+    parser.add_argument('--serve', action='store_true',
+                        help="Keep the model and jobs loaded and answer POST /match requests over HTTP")
+    parser.add_argument('--host', default='127.0.0.1', help="Address the match server listens on")
+    parser.add_argument('--port', type=int, default=8765, help="Port the match server listens on")
+    parser.add_argument('--max-batch-size', type=int, default=32,
+                        help="Most concurrent resumes encoded together by the match server")
+    parser.add_argument('--max-wait-ms', type=float, default=5,
+                        help="Longest a request waits for others to share its encode batch")
+    instrumentation.add_arguments(parser)
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    with instrumentation.from_args(args):
+        run(args)
+
+def run(args):
     try:
-        matcher = ResumeJobMatcher()
+        index_params = (
+            {'nprobe': args.nprobe, 'n_lists': args.n_lists} if args.index == 'ivf'
+            else {'max_memory_mb': args.max_memory_mb}
+        )
+        matcher = ResumeJobMatcher(
+            index_kind=args.index, index_params=index_params, index_path=args.index_path,
+            tech_weight=args.tech_weight, chunked_encoding=args.chunked_encoding,
+            chunk_overlap=args.chunk_overlap, resume_index_path=args.resume_index, retrieval=args.retrieval,
+            bm25_candidates=args.bm25_candidates, fusion=args.fusion, fusion_weight=args.fusion_weight
+        )
         
-        # Load jobs from Paraform CSV
-        matcher.load_jobs('Paraform_Jobs - S1.csv')
+        # Load jobs from Paraform CSV; keyword search needs no job embeddings, but shortlists
+        # and the index reports always work on them
+        needs_embeddings = args.shortlist or args.recall_report or args.quantization_report
+        matcher.load_jobs(
+            'Paraform_Jobs - S1.csv',
+            embed=bool(needs_embeddings) or (args.retrieval != 'keyword' and not args.keyword_query)
+        )
+        job_filter = JobFilter(
+            workplace=args.workplace, min_salary=args.min_salary, max_yoe=args.max_yoe,
+            locations=args.location, needs_visa=args.needs_visa, keep_unknown=args.keep_unknown
+        )
+
+        if args.keyword_query:
+            print_results([{
+                'resume_name': f"Query: {args.keyword_query}",
+                'matches': matcher.search_jobs(args.keyword_query, n=args.top_n, job_filter=job_filter)
+            }])
+            return
+
+        if args.serve:
+            # http.server and friends are only needed here
+            from match_server import serve
+            serve(
+                matcher, host=args.host, port=args.port, n=args.top_n,
+                max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms
+            )
+            return
+
+        if args.watch:
+            ResumeWatcher(
+                matcher, results_path=args.results_path, interval=args.watch_interval, n=args.top_n
+            ).run()
+            return
         
+        if args.shortlist:
+            # New or changed resumes are added to the index; the rest are served from it
+            if matcher.resume_dir.exists():
+                matcher.load_resumes(workers=args.workers, timeout=args.pdf_timeout)
+            print_shortlists(matcher.shortlist_resumes(args.shortlist_jobs, k=args.shortlist))
+            return
+
         # Load resumes from the resumes directory
-        if matcher.load_resumes():
+        if matcher.load_resumes(workers=args.workers, timeout=args.pdf_timeout):
             # Perform matching
-            results = matcher.match_all_resumes()
+            if args.recall_report:
+                print(json.dumps(matcher.index_recall_report(), indent=2))
+            if args.quantization_report:
+                queries = matcher.encode_resumes(matcher.resumes.values())
+                matcher.require_job_embeddings('The quantization report')
+                print(json.dumps(quantization_report(matcher.job_embeddings, queries), indent=2))
+
+            results = matcher.match_all_resumes(
+                n=args.top_n, batched=args.batched, max_memory_mb=args.max_memory_mb, job_filter=job_filter
+            )
             
             # Print results
             print_results(results)
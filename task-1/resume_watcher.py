@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from pdf_extraction import extract_texts
+
+
+def _json_default(value):
+    """Serialize NumPy scalars found in job rows"""
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+class ResumeWatcher:
+    """Long-running watch mode that only re-matches resumes that appear or change.
+
+    The resumes directory is polled with os.scandir; a file is processed once its
+    size and mtime have been stable for one poll, so half-copied PDFs are not parsed.
+    """
+
+    def __init__(self, matcher, results_path='match_results.json', interval=0.25, n=2):
+        self.matcher = matcher
+        self.results_path = Path(results_path)
+        self.interval = interval
+        self.n = n
+        self.processed = {}   # name -> (size, mtime_ns) of the version that was matched
+        self.pending = {}     # name -> (size, mtime_ns) seen on the last poll but not yet stable
+        self.results = {}     # name -> list of matches
+
+    def scan(self):
+        """Current (size, mtime_ns) of every PDF in the resumes directory"""
+        current = {}
+        with os.scandir(self.matcher.resume_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith('.pdf'):
+                    stat = entry.stat()
+                    current[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        return current
+
+    def poll_once(self):
+        """Process one round of directory changes; returns True if results changed"""
+        current = self.scan()
+        changed = False
+
+        for name in [name for name in self.processed if name not in current]:
+            self.evict(name)
+            changed = True
+        for name in [name for name in self.pending if name not in current]:
+            del self.pending[name]
+
+        for name, signature in current.items():
+            if self.processed.get(name) == signature:
+                continue
+            if self.pending.get(name) != signature:
+                # First sighting of this version; wait one poll for the write to settle
+                self.pending[name] = signature
+                continue
+            del self.pending[name]
+            self.processed[name] = signature
+            changed = self.process(name) or changed
+
+        if changed:
+            self.write_results()
+        return changed
+
+    def process(self, name):
+        """Extract, embed and match a single resume"""
+        start = time.perf_counter()
+        path = self.matcher.resume_dir / name
+        resume_text = extract_texts([path], cache=self.matcher.text_cache).get(path)
+        if not resume_text:
+            logging.warning(f"Could not extract text from {name}")
+            self.matcher.resumes.pop(name, None)
+            return self.results.pop(name, None) is not None
+
+        self.matcher.resumes[name] = resume_text
+        self.results[name] = self.matcher.find_top_matches(resume_text, n=self.n)
+        logging.info(f"Matched {name} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return True
+
+    def evict(self, name):
+        """Forget a resume that was deleted from the directory"""
+        self.processed.pop(name, None)
+        self.matcher.resumes.pop(name, None)
+        self.results.pop(name, None)
+        logging.info(f"Removed {name}")
+
+    def write_results(self):
+        """Atomically write the current results in match_all_resumes format"""
+        results = [
+            {'resume_name': name, 'matches': matches}
+            for name, matches in sorted(self.results.items())
+        ]
+        tmp_path = self.results_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, default=_json_default)
+        os.replace(tmp_path, self.results_path)
+
+    def run(self):
+        """Poll until interrupted"""
+        if not self.matcher.resume_dir.exists():
+            logging.error(f"Resume directory {self.matcher.resume_dir} does not exist!")
+            return
+        logging.info(f"Watching {self.matcher.resume_dir} for resumes (Ctrl+C to stop)")
+        try:
+            while True:
+                self.poll_once()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            logging.info("Stopped watching resumes")
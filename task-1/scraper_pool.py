@@ -0,0 +1,159 @@
+import argparse
+import logging
+import queue
+import threading
+import time
+
+import instrumentation
+from srn_scraper import SRNScraper
+from srn_store import HtmlStore, JobRecordWriter, diff_path, diff_snapshots, job_key, load_known_jobs, write_diff
+
+
+class ScraperPool:
+    """Scrapes many curated-list URLs concurrently with a fixed set of warm browsers.
+
+    Each worker thread owns one SRNScraper (one headless Chrome) and takes URLs from
+    a shared queue, so total time grows with len(urls) / size rather than len(urls).
+    A URL that fails, exceeds timeout or cannot get a browser is retried up to `retries` times on a fresh
+    browser; each browser is also replaced after pages_per_driver pages to bound its memory.
+    """
+
+    def __init__(self, size=4, pages_per_driver=20, timeout=120, retries=2, bulk=True,
+                 scraper_factory=SRNScraper, known_jobs=None):
+        self.size = size
+        self.pages_per_driver = pages_per_driver
+        self.timeout = timeout
+        self.retries = retries
+        self.bulk = bulk
+        self.scraper_factory = scraper_factory
+        # Previous snapshot's records by fingerprint; unchanged cards reuse them
+        self.known_jobs = known_jobs or {}
+        self.lock = threading.Lock()
+        self.results = {}   # url -> list of job records
+        self.failed = {}    # url -> last error message
+
+    def _worker(self, urls):
+        scraper = None
+        pages = 0
+        try:
+            while True:
+                try:
+                    url, attempt = urls.get_nowait()
+                except queue.Empty:
+                    return
+
+                start = time.perf_counter()
+                try:
+                    # A browser that fails to start counts as a failed attempt for this URL
+                    if scraper is None or pages >= self.pages_per_driver:
+                        if scraper is not None:
+                            scraper.__exit__(None, None, None)
+                            scraper = None
+                        with instrumentation.span('scraper.browser_start'):
+                            scraper = self.scraper_factory()
+                        instrumentation.count('scraper.browsers_started')
+                        scraper.known_jobs = self.known_jobs
+                        pages = 0
+                    pages += 1
+                    jobs = scraper.collect_jobs(url, bulk=self.bulk, timeout=self.timeout)
+                    for job in jobs:
+                        job['source_url'] = url
+                    with self.lock:
+                        self.results[url] = jobs
+                    logging.info(f"Scraped {len(jobs)} jobs from {url} in {time.perf_counter() - start:.1f}s")
+                except Exception as e:
+                    # The browser may be wedged after a timeout; start the retry on a fresh one
+                    if scraper is not None:
+                        scraper.__exit__(None, None, None)
+                        scraper = None
+                    instrumentation.count('scraper.page_failures')
+                    if attempt < self.retries:
+                        logging.warning(f"Attempt {attempt + 1} for {url} failed ({e}); retrying")
+                        urls.put((url, attempt + 1))
+                    else:
+                        logging.error(f"Giving up on {url} after {attempt + 1} attempts: {e}")
+                        with self.lock:
+                            self.failed[url] = str(e)
+        finally:
+            if scraper is not None:
+                scraper.__exit__(None, None, None)
+
+    def scrape(self, urls):
+        """Scrape every URL and return the merged, deduplicated job records.
+
+        Jobs are kept in the order of urls; a job listed on several lists keeps its
+        first occurrence, with every list it appeared on in 'source_urls'.
+        """
+        urls = list(dict.fromkeys(urls))
+        self.results, self.failed = {}, {}
+        work = queue.Queue()
+        for url in urls:
+            work.put((url, 0))
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self._worker, args=(work,), daemon=True)
+                   for _ in range(min(self.size, len(urls)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        merged = {}
+        for url in urls:
+            for job in self.results.get(url, []):
+                key = job_key(job)
+                if key in merged:
+                    merged[key]['source_urls'].append(url)
+                else:
+                    job['source_urls'] = [url]
+                    merged[key] = job
+        logging.info(
+            f"Scraped {len(self.results)}/{len(urls)} lists into {len(merged)} unique jobs "
+            f"with {len(threads)} browsers in {time.perf_counter() - start:.1f}s"
+        )
+        return list(merged.values())
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Scrape several SRN curated lists concurrently')
+    parser.add_argument('urls', nargs='*', help='Curated list URLs')
+    parser.add_argument('--urls-file', help='File with one URL per line')
+    parser.add_argument('--drivers', type=int, default=4, help='Number of warm headless browsers')
+    parser.add_argument('--pages-per-driver', type=int, default=20, help='Restart a browser after this many pages')
+    parser.add_argument('--timeout', type=float, default=120, help='Seconds allowed per URL')
+    parser.add_argument('--retries', type=int, default=2, help='Retries per URL after a failure')
+    parser.add_argument('--output', default='srn_jobs.jsonl', help='Merged JSONL snapshot')
+    parser.add_argument('--html-dir', default='srn_html', help='Directory of the compressed card HTML store')
+    instrumentation.add_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with instrumentation.from_args(args):
+        run(args)
+
+
+def run(args):
+    urls = list(args.urls)
+    if args.urls_file:
+        with open(args.urls_file, 'r', encoding='utf-8') as f:
+            urls.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+
+    previous_jobs = load_known_jobs(args.output)
+    pool = ScraperPool(
+        size=args.drivers, pages_per_driver=args.pages_per_driver,
+        timeout=args.timeout, retries=args.retries, known_jobs=previous_jobs
+    )
+    jobs = pool.scrape(urls)
+    if not jobs:
+        logging.warning("No jobs found!")
+        return
+    with JobRecordWriter(args.output, HtmlStore(args.html_dir)) as writer:
+        records = [writer.write(job) for job in jobs]
+    logging.info(f"Wrote {writer.count} jobs to {args.output}")
+    write_diff(diff_path(args.output), diff_snapshots(previous_jobs.values(), records), source_urls=urls)
+
+
+if __name__ == "__main__":
+    main()
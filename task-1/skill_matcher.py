@@ -0,0 +1,80 @@
+import re
+
+import numpy as np
+
+from lazy_imports import LazyModule
+
+sparse = LazyModule('scipy.sparse')
+
+
+class SkillVocabulary:
+    """Technologies from the loaded jobs' tech stacks, matched against text in one regex pass.
+
+    Matching keeps the original substring semantics of `tech.lower() in text.lower()`:
+    a lookahead alternation reports the longest term starting at every position, and
+    every shorter term that is a prefix of it (e.g. 'java' in 'javascript') is implied.
+    """
+
+    def __init__(self, terms):
+        self.terms = sorted({term for term in terms if term.strip()}, key=lambda term: (-len(term), term))
+        self.term_ids = {term: i for i, term in enumerate(self.terms)}
+        self.pattern = None
+        if self.terms:
+            self.pattern = re.compile('(?=(' + '|'.join(re.escape(term) for term in self.terms) + '))')
+        self.implied = {
+            term: [self.term_ids[other] for other in self.terms if term.startswith(other)]
+            for term in self.terms
+        }
+
+    def __len__(self):
+        return len(self.terms)
+
+    @staticmethod
+    def split_tech_stack(tech_stack):
+        """Technologies listed in a job's 'Tech Stack' field, as written"""
+        if not isinstance(tech_stack, str):
+            return []
+        return [tech for tech in tech_stack.split(', ') if tech.strip()]
+
+    @classmethod
+    def from_tech_stacks(cls, tech_stacks):
+        return cls(tech.lower() for stack in tech_stacks for tech in cls.split_tech_stack(stack))
+
+    def skill_ids(self, text):
+        """Set of vocabulary ids whose term occurs anywhere in text"""
+        if self.pattern is None or not isinstance(text, str):
+            return set()
+        found = set()
+        for longest in set(self.pattern.findall(text.lower())):
+            found.update(self.implied[longest])
+        return found
+
+    def _binary_matrix(self, id_sets):
+        indptr = np.zeros(len(id_sets) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(ids) for ids in id_sets])
+        indices = np.fromiter((i for ids in id_sets for i in sorted(ids)), dtype=np.int32, count=indptr[-1])
+        data = np.ones(len(indices), dtype=np.float32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(id_sets), len(self.terms)))
+
+    def text_matrix(self, texts):
+        """Sparse texts x vocabulary skill-presence matrix (one regex pass per text)"""
+        return self._binary_matrix([self.skill_ids(text) for text in texts])
+
+    def job_matrix(self, tech_stacks):
+        """Sparse jobs x vocabulary matrix of each job's required skills"""
+        id_sets = []
+        for stack in tech_stacks:
+            ids = {self.term_ids.get(tech.lower()) for tech in self.split_tech_stack(stack)}
+            ids.discard(None)
+            id_sets.append(ids)
+        return self._binary_matrix(id_sets)
+
+    @staticmethod
+    def pair_overlap(resume_matrix, job_matrix, resume_rows, job_rows):
+        """Tech overlap for selected (resume row, job row) pairs without forming the full product"""
+        resume_rows = np.asarray(resume_rows).ravel()
+        job_rows = np.asarray(job_rows).ravel()
+        jobs = job_matrix[job_rows]
+        shared = np.asarray(resume_matrix[resume_rows].multiply(jobs).sum(axis=1)).ravel()
+        required = np.asarray(jobs.sum(axis=1)).ravel()
+        return np.divide(shared, required, out=np.zeros_like(shared), where=required > 0)
@@ -0,0 +1,129 @@
+import argparse
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from srn_scraper import CARD_FIELDS, JOB_CARD_SELECTOR, SRNScraper
+from srn_store import HtmlStore, iter_job_records
+
+# html.parser ships with Python; lxml is faster when installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+_scraper = None
+
+
+def _get_scraper():
+    """Browser-less scraper reused for post-processing within a process"""
+    global _scraper
+    if _scraper is None:
+        _scraper = SRNScraper(launch_browser=False)
+    return _scraper
+
+
+def _element_text(elem):
+    return elem.get_text('\n', strip=True)
+
+
+def raw_cards_from_html(html):
+    """Same {'fields', 'text', 'html'} dicts the in-browser bulk extraction returns"""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    cards = soup.select(JOB_CARD_SELECTOR)
+    # A stored card's outerHTML is itself the card element
+    if not cards and soup.find() is not None and soup.find().select_one(CARD_FIELDS['Company']) is not None:
+        cards = [soup.find()]
+
+    raw_cards = []
+    for card in cards:
+        fields = {}
+        for name, selector in CARD_FIELDS.items():
+            elem = card.select_one(selector)
+            fields[name] = _element_text(elem) if elem is not None else None
+        raw_cards.append({'fields': fields, 'text': _element_text(card), 'html': str(card)})
+    return raw_cards
+
+
+def parse_html(html):
+    """Job records for every card in a page source or card snippet"""
+    scraper = _get_scraper()
+    jobs = []
+    for raw in raw_cards_from_html(html):
+        job_data = scraper.build_job_record(raw)
+        if job_data:
+            jobs.append(job_data)
+    return jobs
+
+
+def parse_page_file(path):
+    """Job records from a saved page_source.html"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_html(f.read())
+
+
+def saved_job_snippets(jobs_path, html_dir='srn_html'):
+    """Card HTML of a previous scrape: an srn_jobs.jsonl whose cards are in the HTML store,
+    or a legacy srn_jobs.json with inline HTML"""
+    if Path(jobs_path).suffix == '.jsonl':
+        store = HtmlStore(html_dir)
+        return [store.get(job['html_key']) for job in iter_job_records(jobs_path) if job.get('html_key')]
+    with open(jobs_path, 'r', encoding='utf-8') as f:
+        return [job['html'] for job in json.load(f).get('jobs', []) if job.get('html')]
+
+
+def parse_many(items, parse_fn, workers=1, chunksize=8):
+    """Apply parse_fn to every item (in a process pool when workers > 1), keeping input order"""
+    if workers > 1 and len(items) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(parse_fn, items, chunksize=chunksize))
+    return [parse_fn(item) for item in items]
+
+
+def parse_saved(pages=(), job_files=(), workers=1, html_dir='srn_html'):
+    """Re-derive jobs from saved page sources and previous scrapes' card HTML without a browser"""
+    start = time.perf_counter()
+    jobs = []
+    for page_jobs in parse_many(list(pages), parse_page_file, workers=workers):
+        jobs.extend(page_jobs)
+
+    snippets = [snippet for json_path in job_files for snippet in saved_job_snippets(json_path, html_dir)]
+    for card_jobs in parse_many(snippets, parse_html, workers=workers, chunksize=64):
+        jobs.extend(card_jobs)
+
+    elapsed = time.perf_counter() - start
+    logging.info(f"Parsed {len(jobs)} jobs from {len(pages)} pages and {len(snippets)} saved cards in {elapsed:.2f}s")
+    return jobs
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Extract SRN jobs from saved HTML without launching Chrome')
+    parser.add_argument('pages', nargs='*', help='Saved page sources (e.g. page_source.html)')
+    parser.add_argument('--from-json', action='append', default=[],
+                        help='Re-parse the card HTML of a previous srn_jobs.jsonl or srn_jobs.json (repeatable)')
+    parser.add_argument('--html-dir', default='srn_html', help='HTML store used by .jsonl snapshots')
+    parser.add_argument('--workers', type=int, default=1, help='Parser processes')
+    parser.add_argument('--output', default='srn_jobs_offline.json', help='Where to write the jobs')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    jobs = parse_saved(args.pages, args.from_json, workers=args.workers, html_dir=args.html_dir)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_jobs': len(jobs),
+            'jobs': jobs,
+            'source_files': [str(Path(path)) for path in [*args.pages, *args.from_json]]
+        }, f, indent=2)
+    logging.info(f"Wrote {len(jobs)} jobs to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import logging
 import json
+import re
 import time
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -7,6 +8,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
+import instrumentation
+from keyword_classifier import INDUSTRY_CLASSIFIER, TECH_CLASSIFIER
+from srn_store import HtmlStore, JobRecordWriter, card_fingerprint, diff_path, diff_snapshots, load_known_jobs, write_diff
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,9 +22,58 @@ logging.basicConfig(
     ]
 )
 
+YOE_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*(?:years?|yrs?).+?experience'),
+    re.compile(r'(\d+)-(\d+)\s*(?:years?|yrs?).+?experience')
+]
+
+EQUITY_PATTERNS = [
+    re.compile(r'(\d+(?:\.\d+)?%?\s*-\s*\d+(?:\.\d+)?%?)\s*equity'),
+    re.compile(r'(\d+(?:\.\d+)?%?)\s*equity')
+]
+
+JOB_CARD_SELECTOR = '.clickable-element.bubble-element.Group.baTaYaDaT'
+
+# CSS selector of each field inside a job card
+CARD_FIELDS = {
+    'Company': '.bubble-element.Text.baTaYaDaL',
+    'Role': '.bubble-element.Text.baTaYaGaR0',
+    'Locations': '.bubble-element.Text.baTaYaDe',
+    'Salary': '.bubble-element.Text.baTaYaEf',
+    'Workplace': '.bubble-element.Text.baTaYaEs',
+}
+REQUIRED_CARD_FIELDS = ('Company', 'Role', 'Locations')
+
+# Every card's field texts, full text and HTML in a single WebDriver round trip
+BULK_EXTRACT_SCRIPT = """
+const cards = document.querySelectorAll(arguments[0]);
+const fields = arguments[1];
+return JSON.stringify(Array.from(cards, card => {
+    const values = {};
+    for (const [name, selector] of Object.entries(fields)) {
+        const elem = card.querySelector(selector);
+        values[name] = elem ? elem.innerText : null;
+    }
+    return {fields: values, text: card.innerText, html: card.outerHTML};
+}));
+"""
+
+# Page height and number of rendered job cards, read in one round trip
+PAGE_STATE_SCRIPT = "return [document.body.scrollHeight, document.querySelectorAll(arguments[0]).length];"
+
 class SRNScraper:
-    def __init__(self):
-        """Initialize the scraper with Chrome webdriver"""
+    def __init__(self, load_timeout=15, scroll_timeout=2, max_scrolls=100, launch_browser=True):
+        """Initialize the scraper with Chrome webdriver (launch_browser=False for offline parsing only)"""
+        self.load_timeout = load_timeout      # max seconds to wait for the first job card
+        self.scroll_timeout = scroll_timeout  # max seconds to wait for a scroll to load more content
+        self.max_scrolls = max_scrolls
+        self.timings = {}
+        # Records of a previous scrape by fingerprint; cards whose fingerprint is known skip post-processing
+        self.known_jobs = {}
+        self.reused_jobs = 0
+        self.driver = None
+        if not launch_browser:
+            return
         chrome_options = Options()
         chrome_options.add_argument("--headless")
         chrome_options.add_argument("--no-sandbox")
@@ -29,28 +83,13 @@ class SRNScraper:
         
     def parse_tech_stack(self, description_text):
         """Extract tech stack from job description"""
-        common_techs = [
-            'Python', 'JavaScript', 'TypeScript', 'React', 'Node.js', 'AWS', 
-            'GCP', 'Azure', 'Docker', 'Kubernetes', 'PostgreSQL', 'MongoDB',
-            'Redis', 'GraphQL', 'REST', 'FastAPI', 'Django', 'Flask', 'Vue',
-            'Angular', 'Next.js', 'Express', 'Go', 'Rust', 'Java', 'C++',
-            'TensorFlow', 'PyTorch', 'OpenAI', 'Git', 'CI/CD'
-        ]
-        found_techs = []
-        for tech in common_techs:
-            if tech.lower() in description_text.lower():
-                found_techs.append(tech)
-        return ', '.join(found_techs) if found_techs else ''
+        return ', '.join(TECH_CLASSIFIER.classify_ordered(description_text))
 
     def parse_yoe(self, description_text):
         """Extract years of experience requirement"""
-        import re
-        patterns = [
-            r'(\d+)\+?\s*(?:years?|yrs?).+?experience',
-            r'(\d+)-(\d+)\s*(?:years?|yrs?).+?experience'
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, description_text.lower())
+        description_text = description_text.lower()
+        for pattern in YOE_PATTERNS:
+            match = pattern.search(description_text)
             if match:
                 if len(match.groups()) == 2:
                     return f"{match.group(1)} - {match.group(2)} years"
@@ -59,158 +98,232 @@ class SRNScraper:
 
     def extract_equity(self, text):
         """Extract equity information from text"""
-        import re
-        equity_patterns = [
-            r'(\d+(?:\.\d+)?%?\s*-\s*\d+(?:\.\d+)?%?)\s*equity',
-            r'(\d+(?:\.\d+)?%?)\s*equity'
-        ]
-        for pattern in equity_patterns:
-            match = re.search(pattern, text.lower())
+        text = text.lower()
+        for pattern in EQUITY_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         return "Competitive"
 
-    def extract_job_data(self, job_element):
-        """Extract data from a job element"""
+    def build_job_record(self, raw):
+        """Turn a card's raw field texts, full text and HTML into a job record.
+
+        raw is {'fields': {field name: text or None}, 'text': ..., 'html': ...}. Returns
+        None when company, role or location is missing. A card whose fingerprint is in
+        known_jobs returns a copy of that record with a fresh timestamp.
+        """
+        fields = raw.get('fields') or {}
+        missing = [name for name in REQUIRED_CARD_FIELDS if fields.get(name) is None]
+        if missing:
+            logging.error(f"Error extracting job data: missing {', '.join(missing)}")
+            instrumentation.count('scraper.cards_skipped')
+            return None
+
+        fingerprint = card_fingerprint(fields, raw.get('text'))
+        if fingerprint in self.known_jobs:
+            self.reused_jobs += 1
+            instrumentation.count('scraper.jobs_reused')
+            job_data = dict(self.known_jobs[fingerprint])
+            job_data['timestamp'] = time.strftime('%Y-%m-%d %H:%M:%S')
+            return job_data
+
         job_data = {
             'source': 'SRN',
             'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
         }
+        for name in REQUIRED_CARD_FIELDS:
+            job_data[name] = fields[name].strip()
+
+        if fields.get('Salary') is None:
+            job_data['Salary'] = 'Not specified'
+        else:
+            salary_text = fields['Salary'].strip()
+            job_data['Salary'] = salary_text
+            # Extract equity if mentioned in salary text
+            if 'equity' in salary_text.lower():
+                job_data['Equity'] = self.extract_equity(salary_text)
+
+        workplace = fields.get('Workplace')
+        job_data['Workplace'] = 'Not specified' if workplace is None else workplace.strip()
+
+        # Extract additional information from job description
+        description_text = raw.get('text') or ''
+        
+        # Tech Stack
+        job_data['Tech Stack'] = self.parse_tech_stack(description_text)
         
+        # Years of Experience
+        job_data['YOE'] = self.parse_yoe(description_text)
+        
+        # Industry (based on keywords)
+        industries = INDUSTRY_CLASSIFIER.classify_ordered(description_text)
+        job_data['Industry'] = ', '.join(industries) if industries else 'Tech'
+        
+        # Additional fields with default values
+        job_data['Visa'] = 'Contact company'
+        job_data['Team Size'] = 'Not specified'
+        job_data['Funding'] = 'Not specified'
+        job_data['Requirements'] = 'See job description'
+        job_data['One liner'] = ''  # Would need specific element for this
+        
+        job_data['fingerprint'] = fingerprint
+        # Save HTML for reference
+        job_data['html'] = raw.get('html', '')
+        return job_data
+
+    def extract_job_data(self, job_element):
+        """Extract data from a job element (several WebDriver round trips per card)"""
         try:
-            # Company and basic info extraction (existing code)
-            company_elem = job_element.find_element(By.CSS_SELECTOR, '.bubble-element.Text.baTaYaDaL')
-            if company_elem:
-                job_data['Company'] = company_elem.text.strip()
-            
-            role_elem = job_element.find_element(By.CSS_SELECTOR, '.bubble-element.Text.baTaYaGaR0')
-            if role_elem:
-                job_data['Role'] = role_elem.text.strip()
-            
-            location_elem = job_element.find_element(By.CSS_SELECTOR, '.bubble-element.Text.baTaYaDe')
-            if location_elem:
-                job_data['Locations'] = location_elem.text.strip()
-            
-            try:
-                salary_elem = job_element.find_element(By.CSS_SELECTOR, '.bubble-element.Text.baTaYaEf')
-                if salary_elem:
-                    salary_text = salary_elem.text.strip()
-                    job_data['Salary'] = salary_text
-                    # Extract equity if mentioned in salary text
-                    if 'equity' in salary_text.lower():
-                        job_data['Equity'] = self.extract_equity(salary_text)
-            except:
-                job_data['Salary'] = 'Not specified'
-            
-            try:
-                workplace_elem = job_element.find_element(By.CSS_SELECTOR, '.bubble-element.Text.baTaYaEs')
-                if workplace_elem:
-                    job_data['Workplace'] = workplace_elem.text.strip()
-            except:
-                job_data['Workplace'] = 'Not specified'
-
-            # Extract additional information from job description
-            description_text = job_element.text
-            
-            # Tech Stack
-            job_data['Tech Stack'] = self.parse_tech_stack(description_text)
-            
-            # Years of Experience
-            job_data['YOE'] = self.parse_yoe(description_text)
-            
-            # Industry (based on keywords)
-            industries = []
-            industry_keywords = {
-                'AI': ['ai', 'machine learning', 'deep learning', 'ml', 'artificial intelligence'],
-                'Fintech': ['fintech', 'financial', 'banking', 'payment'],
-                'Enterprise': ['enterprise', 'b2b', 'saas'],
-                'Data': ['data', 'analytics', 'big data'],
-                'DevTools': ['developer', 'tools', 'devtools', 'dev tools'],
-            }
-            for industry, keywords in industry_keywords.items():
-                if any(keyword in description_text.lower() for keyword in keywords):
-                    industries.append(industry)
-            job_data['Industry'] = ', '.join(industries) if industries else 'Tech'
-            
-            # Additional fields with default values
-            job_data['Visa'] = 'Contact company'
-            job_data['Team Size'] = 'Not specified'
-            job_data['Funding'] = 'Not specified'
-            job_data['Requirements'] = 'See job description'
-            job_data['One liner'] = ''  # Would need specific element for this
-            
-            # Save HTML for reference
-            job_data['html'] = job_element.get_attribute('outerHTML')
-            
-            return job_data
-            
+            fields = {}
+            for name, selector in CARD_FIELDS.items():
+                elems = job_element.find_elements(By.CSS_SELECTOR, selector)
+                fields[name] = elems[0].text if elems else None
+            raw = {'fields': fields, 'text': job_element.text, 'html': job_element.get_attribute('outerHTML')}
+            # One find_elements (and .text) per field, plus the card's text and HTML
+            instrumentation.count('scraper.webdriver_calls', 2 * len(CARD_FIELDS) + 2)
+            return self.build_job_record(raw)
         except Exception as e:
             logging.error(f"Error extracting job data: {str(e)}")
             return None
 
-    def scrape_jobs(self, url):
-        """Scrape job listings from SRN website"""
+    def extract_all_jobs(self, writer=None):
+        """Extract every job card on the page with one execute_script call.
+
+        Each record is passed through writer.write() as soon as it is built.
+        """
+        raw_cards = json.loads(self.driver.execute_script(BULK_EXTRACT_SCRIPT, JOB_CARD_SELECTOR, CARD_FIELDS))
+        instrumentation.count('scraper.webdriver_calls')
+        logging.info(f"Found {len(raw_cards)} potential job elements")
+        jobs_data = []
+        for i, raw in enumerate(raw_cards, 1):
+            job_data = self.build_job_record(raw)
+            if job_data:
+                jobs_data.append(writer.write(job_data) if writer else job_data)
+                logging.info(f"Scraped job {i}: {job_data.get('Role')} at {job_data.get('Company')}")
+        return jobs_data
+
+    def page_state(self):
+        """(scrollHeight, job card count) of the current page"""
+        instrumentation.count('scraper.webdriver_calls')
+        return tuple(self.driver.execute_script(PAGE_STATE_SCRIPT, JOB_CARD_SELECTOR))
+
+    def wait_for_cards(self):
+        """Block until the first job card is rendered; returns False on timeout"""
         try:
-            logging.info(f"Starting to scrape jobs from {url}")
-            self.driver.get(url)
-            time.sleep(5)  # Initial wait for content to load
-            
-            # Scroll to load all content
-            scroll_attempts = 0
-            max_attempts = 5
-            
-            while scroll_attempts < max_attempts:
-                # Scroll down
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                # Calculate new scroll height
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                scroll_attempts += 1
-            
-            # Find all job elements using the specific class
-            job_elements = self.driver.find_elements(
-                By.CSS_SELECTOR, 
-                '.clickable-element.bubble-element.Group.baTaYaDaT'
+            WebDriverWait(self.driver, self.load_timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, JOB_CARD_SELECTOR))
             )
-            
-            logging.info(f"Found {len(job_elements)} potential job elements")
-            
-            # Save page source for debugging
-            with open('page_source.html', 'w', encoding='utf-8') as f:
+            return True
+        except TimeoutException:
+            logging.warning(f"No job cards appeared within {self.load_timeout}s")
+            return False
+
+    def scroll_to_end(self, deadline=None):
+        """Scroll until neither the page height nor the card count grows; returns the scroll count.
+
+        After each scroll we wait only as long as it takes the page to change, so an
+        unchanged page ends the loop after one scroll_timeout instead of a fixed sleep.
+        Raises TimeoutException if the page is still growing at deadline (a time.monotonic() value).
+        """
+        state = self.page_state()
+        for scrolls in range(1, self.max_scrolls + 1):
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutException(f"Page still loading after {scrolls - 1} scrolls")
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            instrumentation.count('scraper.webdriver_calls')
+            try:
+                WebDriverWait(self.driver, self.scroll_timeout, poll_frequency=0.1).until(
+                    lambda driver: self.page_state() != state
+                )
+            except TimeoutException:
+                return scrolls
+            state = self.page_state()
+        logging.warning(f"Stopped scrolling after {self.max_scrolls} scrolls with content still loading")
+        return self.max_scrolls
+
+    def extract_jobs_per_element(self, writer=None):
+        """Extract job cards one WebDriver element at a time (slower fallback to extract_all_jobs)"""
+        job_elements = self.driver.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR)
+        instrumentation.count('scraper.webdriver_calls')
+        logging.info(f"Found {len(job_elements)} potential job elements")
+        jobs_data = []
+        for i, job_element in enumerate(job_elements, 1):
+            try:
+                job_data = self.extract_job_data(job_element)
+                if job_data:
+                    jobs_data.append(writer.write(job_data) if writer else job_data)
+                    logging.info(f"Scraped job {i}: {job_data.get('Role')} at {job_data.get('Company')}")
+            except Exception as e:
+                logging.error(f"Error processing job element {i}: {str(e)}")
+        return jobs_data
+
+    def collect_jobs(self, url, bulk=True, writer=None, page_source_path=None, timeout=None):
+        """Load url, scroll it to the end and return its job records without writing any files.
+
+        Errors are raised rather than logged so callers can retry. With timeout, page
+        loading and scrolling must finish within that many seconds.
+        """
+        self.timings = {}
+        self.reused_jobs = 0
+        deadline = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+            self.driver.set_page_load_timeout(timeout)
+        start = time.perf_counter()
+        with instrumentation.span('scraper.load'):
+            self.driver.get(url)
+            self.wait_for_cards()
+        self.timings['load'] = time.perf_counter() - start
+
+        # Scroll until everything lazy-loaded has rendered
+        start = time.perf_counter()
+        with instrumentation.span('scraper.scroll'):
+            scrolls = self.scroll_to_end(deadline)
+        self.timings['scroll'] = time.perf_counter() - start
+        instrumentation.count('scraper.scrolls', scrolls)
+        logging.info(f"Page settled after {scrolls} scrolls")
+
+        if page_source_path:
+            with open(page_source_path, 'w', encoding='utf-8') as f:
                 f.write(self.driver.page_source)
+
+        start = time.perf_counter()
+        with instrumentation.span('scraper.extract'):
+            if bulk:
+                jobs_data = self.extract_all_jobs(writer)
+            else:
+                jobs_data = self.extract_jobs_per_element(writer)
+        self.timings['extract'] = time.perf_counter() - start
+        instrumentation.count('scraper.jobs_extracted', len(jobs_data))
+        instrumentation.count('scraper.pages')
+        if self.known_jobs:
+            logging.info(f"Reused {self.reused_jobs} of {len(jobs_data)} unchanged jobs")
+        logging.info("Scrape timings: " + ', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in self.timings.items()))
+        return jobs_data
+
+    def scrape_jobs(self, url, bulk=True, output='srn_jobs.jsonl', html_dir='srn_html'):
+        """Scrape job listings from SRN website; bulk extracts all cards in one round trip.
+
+        Records are streamed to the output JSONL as they are built, with each card's
+        HTML moved into the compressed store under html_dir. Cards unchanged since the
+        previous snapshot reuse its records, and the added/changed/removed jobs are
+        written to srn_jobs.diff.json.
+        """
+        try:
+            logging.info(f"Starting to scrape jobs from {url}")
+            self.known_jobs = load_known_jobs(output)
+            with JobRecordWriter(output, HtmlStore(html_dir), source_url=url) as writer:
+                # Save page source for debugging
+                jobs_data = self.collect_jobs(url, bulk=bulk, writer=writer, page_source_path='page_source.html')
+                if not jobs_data:
+                    writer.discard()
             
-            # Process each job element
-            jobs_data = []
-            for i, job_element in enumerate(job_elements, 1):
-                try:
-                    # Scroll element into view
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", job_element)
-                    time.sleep(0.5)
-                    
-                    # Get job data
-                    job_data = self.extract_job_data(job_element)
-                    if job_data:
-                        jobs_data.append(job_data)
-                        logging.info(f"Scraped job {i}: {job_data.get('Role')} at {job_data.get('Company')}")
-                except Exception as e:
-                    logging.error(f"Error processing job element {i}: {str(e)}")
-            
-            # Save results
             if jobs_data:
-                with open('srn_jobs.json', 'w', encoding='utf-8') as f:
-                    json.dump({
-                        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-                        'total_jobs': len(jobs_data),
-                        'jobs': jobs_data,
-                        'source_url': url
-                    }, f, indent=2)
-                    
-                logging.info(f"Successfully scraped {len(jobs_data)} jobs")
-                return jobs_data
+                logging.info(f"Successfully scraped {len(jobs_data)} jobs into {output}")
+                write_diff(diff_path(output), diff_snapshots(self.known_jobs.values(), jobs_data), source_url=url)
             else:
                 logging.warning("No jobs found!")
-                return []
+            return jobs_data
                 
         except Exception as e:
             logging.error(f"Error scraping jobs: {str(e)}")
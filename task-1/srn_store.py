@@ -0,0 +1,194 @@
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+
+class HtmlStore:
+    """Gzip-compressed card HTML addressed by the SHA-256 of its content.
+
+    Identical cards from repeated scrapes are stored once, and job records only
+    carry the key, so reading jobs never has to touch the HTML.
+    """
+
+    def __init__(self, root='srn_html'):
+        self.root = Path(root)
+
+    @staticmethod
+    def make_key(html):
+        return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+    def path_for(self, key):
+        return self.root / key[:2] / f"{key}.html.gz"
+
+    def __contains__(self, key):
+        return self.path_for(key).exists()
+
+    def put(self, html):
+        """Store html if it is new; returns its key"""
+        key = self.make_key(html)
+        path = self.path_for(key)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.write(html)
+            os.replace(tmp_path, path)
+        return key
+
+    def get(self, key):
+        with gzip.open(self.path_for(key), 'rt', encoding='utf-8') as f:
+            return f.read()
+
+
+class JobRecordWriter:
+    """Writes job records to a JSONL file one line at a time, moving their HTML into an HtmlStore.
+
+    Lines go to a temporary file that replaces jsonl_path on close, so readers
+    never see a half-written snapshot.
+    """
+
+    def __init__(self, jsonl_path, html_store=None, **common_fields):
+        self.jsonl_path = Path(jsonl_path)
+        self.html_store = html_store
+        self.common_fields = common_fields
+        self.count = 0
+        self.tmp_path = self.jsonl_path.with_suffix(self.jsonl_path.suffix + '.tmp')
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+
+    def write(self, job):
+        """Write one record; returns it without its HTML"""
+        record = dict(job)
+        html = record.pop('html', None)
+        if html and self.html_store is not None:
+            record['html_key'] = self.html_store.put(html)
+        record.update(self.common_fields)
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+        self.count += 1
+        return record
+
+    def close(self):
+        """Publish the snapshot"""
+        if self.file.closed:
+            return
+        self.file.close()
+        os.replace(self.tmp_path, self.jsonl_path)
+
+    def discard(self):
+        """Drop what was written and keep the previous snapshot"""
+        if self.file.closed:
+            return
+        self.file.close()
+        os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def iter_job_records(path):
+    """Stream job records from a JSONL snapshot, or from a legacy srn_jobs.json (without their HTML)"""
+    path = Path(path)
+    if path.suffix == '.jsonl':
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for job in data.get('jobs', []):
+        job.pop('html', None)
+        yield job
+
+
+def job_key(job):
+    """Identity of a job across scrapes and curated lists: the same posting can appear in several"""
+    return tuple(str(job.get(field, '')).strip().lower() for field in ('Company', 'Role', 'Locations'))
+
+
+def card_fingerprint(fields, text):
+    """Hash of a card's company, role, location, salary and full text.
+
+    Computed from the raw card before any post-processing, so an unchanged card can
+    reuse its previous record.
+    """
+    text_hash = hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+    parts = [(fields.get(name) or '').strip() for name in ('Company', 'Role', 'Locations', 'Salary')]
+    return hashlib.sha256('\0'.join(parts + [text_hash]).encode('utf-8')).hexdigest()
+
+
+def load_known_jobs(path):
+    """Fingerprint -> record for a previous snapshot, empty if there is none"""
+    if not Path(path).exists():
+        return {}
+    return {job['fingerprint']: job for job in iter_job_records(path) if job.get('fingerprint')}
+
+
+def diff_snapshots(old_jobs, new_jobs):
+    """Jobs added, changed (same company/role/location, new fingerprint) and removed between two scrapes"""
+    old = {job_key(job): job for job in old_jobs}
+    new = {job_key(job): job for job in new_jobs}
+    return {
+        'added': [job for key, job in new.items() if key not in old],
+        'changed': [job for key, job in new.items()
+                    if key in old and old[key].get('fingerprint') != job.get('fingerprint')],
+        'removed': [job for key, job in old.items() if key not in new],
+    }
+
+
+def diff_path(jsonl_path):
+    """srn_jobs.jsonl -> srn_jobs.diff.json"""
+    return Path(jsonl_path).with_suffix('.diff.json')
+
+
+def write_diff(path, diff, **metadata):
+    """Atomically write a snapshot diff next to its snapshot"""
+    path = Path(path)
+    summary = {name: len(jobs) for name, jobs in diff.items()}
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'), **metadata, 'summary': summary, **diff}, f, indent=2)
+    os.replace(tmp_path, path)
+    logging.info(f"Snapshot changes: {summary['added']} added, {summary['changed']} changed, {summary['removed']} removed")
+    return summary
+
+
+def convert_snapshot(json_path, jsonl_path, html_store):
+    """Rewrite a legacy srn_jobs.json as a JSONL snapshot plus HTML store; returns the job count"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    common_fields = {'source_url': data['source_url']} if data.get('source_url') else {}
+    with JobRecordWriter(jsonl_path, html_store, **common_fields) as writer:
+        for job in data.get('jobs', []):
+            writer.write(job)
+    return writer.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert srn_jobs.json into srn_jobs.jsonl plus a compressed HTML store')
+    parser.add_argument('json_path', nargs='?', default='srn_jobs.json')
+    parser.add_argument('jsonl_path', nargs='?', default='srn_jobs.jsonl')
+    parser.add_argument('--html-dir', default='srn_html', help='Directory of the content-addressed HTML store')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    count = convert_snapshot(args.json_path, args.jsonl_path, HtmlStore(args.html_dir))
+    before = os.path.getsize(args.json_path)
+    after = os.path.getsize(args.jsonl_path)
+    logging.info(f"Converted {count} jobs: {before / 1024:.0f} KB JSON -> {after / 1024:.0f} KB JSONL")
+
+
+if __name__ == "__main__":
+    main()
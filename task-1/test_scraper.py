@@ -12,11 +12,11 @@ def main():
             print("\nExample jobs found:")
             for i, job in enumerate(jobs[:3], 1):  # Show first 3 jobs
                 print(f"\nJob {i}:")
-                print(f"Title: {job.get('title', 'N/A')}")
-                print(f"Company: {job.get('company', 'N/A')}")
-                print(f"Location: {job.get('location', 'N/A')}")
-                print(f"Workplace: {job.get('workplace', 'N/A')}")
-                print(f"Salary: {job.get('salary', 'N/A')}")
+                print(f"Title: {job.get('Role', 'N/A')}")
+                print(f"Company: {job.get('Company', 'N/A')}")
+                print(f"Location: {job.get('Locations', 'N/A')}")
+                print(f"Workplace: {job.get('Workplace', 'N/A')}")
+                print(f"Salary: {job.get('Salary', 'N/A')}")
                 print("-" * 80)
 
 if __name__ == "__main__":
@@ -0,0 +1,383 @@
+import logging
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from quantized_store import DTYPES, is_quantized_file, open_quantized, quantize, save_quantized
+
+
+def normalize_rows(matrix):
+    """L2-normalize each row so dot products become cosine similarities"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_rows(scores, k):
+    """Column indices and scores of the k largest entries per row, best first"""
+    n_items = scores.shape[1]
+    k = min(k, n_items)
+    candidates = np.argpartition(scores, n_items - k, axis=1)[:, n_items - k:]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1)
+    return np.take_along_axis(candidate_scores, order, axis=1), np.take_along_axis(candidates, order, axis=1)
+
+
+def chunked_top_k(queries, matrix, k, max_memory_mb=256):
+    """Top-k columns of queries @ matrix.T for every query row, best first.
+
+    Query rows are processed in chunks so the score block plus its argpartition
+    indices stay under max_memory_mb.
+    """
+    n_queries, n_items = len(queries), len(matrix)
+    k = min(k, n_items)
+    top_scores = np.empty((n_queries, k), dtype=np.float32)
+    top_indices = np.empty((n_queries, k), dtype=np.int64)
+    if k <= 0 or n_queries == 0:
+        return top_scores, top_indices
+
+    # float32 scores plus int64 partition indices per cell
+    bytes_per_row = n_items * (4 + 8)
+    chunk_rows = max(1, int(max_memory_mb * 1024 * 1024) // bytes_per_row)
+
+    for start in range(0, n_queries, chunk_rows):
+        end = min(start + chunk_rows, n_queries)
+        top_scores[start:end], top_indices[start:end] = top_k_rows(queries[start:end] @ matrix.T, k)
+    return top_scores, top_indices
+
+
+def save_arrays(path, **arrays):
+    """np.savez to exactly path, atomically; given a name, np.savez itself would append .npz"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+class BruteForceIndex:
+    """Exact inner-product search over L2-normalized vectors"""
+
+    kind = 'exact'
+
+    def __init__(self, max_memory_mb=256):
+        self.max_memory_mb = max_memory_mb
+        self.vectors = None
+
+    def __len__(self):
+        return 0 if self.vectors is None else len(self.vectors)
+
+    def add(self, vectors):
+        """Append vectors; their ids continue from the current size"""
+        vectors = normalize_rows(vectors)
+        self.vectors = vectors if self.vectors is None else np.vstack([self.vectors, vectors])
+
+    def search(self, queries, k, mask=None):
+        """Return (scores, ids) arrays of shape (n_queries, k), best first.
+
+        mask, a boolean array over the ids, restricts scoring to the vectors it selects.
+        """
+        queries = normalize_rows(queries)
+        if self.vectors is None:
+            return np.empty((len(queries), 0), dtype=np.float32), np.empty((len(queries), 0), dtype=np.int64)
+        if mask is None:
+            return chunked_top_k(queries, self.vectors, k, max_memory_mb=self.max_memory_mb)
+        allowed = np.flatnonzero(mask)
+        scores, rows = chunked_top_k(queries, self.vectors[allowed], k, max_memory_mb=self.max_memory_mb)
+        return scores, allowed[rows]
+
+    def save(self, path, **metadata):
+        save_arrays(path, kind=self.kind, vectors=self.vectors, **metadata)
+
+    @classmethod
+    def from_arrays(cls, data):
+        index = cls()
+        index.vectors = data['vectors']
+        return index
+
+
+class IVFIndex:
+    """Inverted-file index: vectors are bucketed by their nearest k-means centroid
+    and a query only scans the nprobe buckets closest to it.
+
+    Raising nprobe trades speed for recall; nprobe == n_lists is an exact search.
+    """
+
+    kind = 'ivf'
+
+    def __init__(self, n_lists=None, nprobe=8, train_iterations=20, seed=0):
+        # Lists to train (default sqrt(n)); once trained, n_lists is the number of centroids
+        self.target_lists = n_lists
+        self.nprobe = nprobe
+        self.train_iterations = train_iterations
+        self.seed = seed
+        self.centroids = None
+        self.vectors = None
+        self.assignments = None
+        self.list_ids = []
+
+    def __len__(self):
+        return 0 if self.vectors is None else len(self.vectors)
+
+    @property
+    def n_lists(self):
+        return self.target_lists if self.centroids is None else len(self.centroids)
+
+    def train(self, vectors):
+        """Spherical k-means over (a sample of) the vectors to place the centroids"""
+        vectors = normalize_rows(vectors)
+        n_lists = self.target_lists or max(1, int(np.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors))
+        rng = np.random.default_rng(self.seed)
+
+        sample_size = min(len(vectors), n_lists * 256)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)]
+
+        for _ in range(self.train_iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            empty = ~sums.any(axis=1)
+            # Re-seed empty lists with random points instead of letting them die
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            centroids = normalize_rows(sums)
+
+        self.centroids = centroids
+        self.list_ids = [np.empty(0, dtype=np.int64) for _ in range(n_lists)]
+
+    def add(self, vectors):
+        """Append vectors, training the centroids first if needed"""
+        vectors = normalize_rows(vectors)
+        if self.centroids is None:
+            self.train(vectors)
+
+        start = len(self)
+        assignments = np.argmax(vectors @ self.centroids.T, axis=1)
+        self.vectors = vectors if self.vectors is None else np.vstack([self.vectors, vectors])
+        self.assignments = assignments if self.assignments is None else np.concatenate([self.assignments, assignments])
+        for list_no in np.unique(assignments):
+            new_ids = start + np.flatnonzero(assignments == list_no)
+            self.list_ids[list_no] = np.concatenate([self.list_ids[list_no], new_ids])
+
+    def search(self, queries, k, nprobe=None, mask=None):
+        """Return (scores, ids) arrays of shape (n_queries, k), best first; missing slots have id -1.
+
+        mask, a boolean array over the ids, drops the vectors it does not select from
+        the probed lists. A mask selecting fewer vectors than the probes would scan is
+        searched exactly instead, so selective filters do not lose recall.
+        """
+        queries = normalize_rows(queries)
+        nprobe = min(nprobe or self.nprobe, self.n_lists or 1)
+        top_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        top_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        if self.vectors is None:
+            return top_scores, top_ids
+
+        if mask is not None:
+            allowed = np.flatnonzero(mask)
+            if len(allowed) <= nprobe * len(self) / len(self.centroids):
+                scores, rows = chunked_top_k(queries, self.vectors[allowed], k)
+                top_scores[:, :rows.shape[1]] = scores
+                top_ids[:, :rows.shape[1]] = allowed[rows]
+                return top_scores, top_ids
+
+        _, probes = top_k_rows(queries @ self.centroids.T, nprobe)
+        for row, query in enumerate(queries):
+            ids = np.concatenate([self.list_ids[list_no] for list_no in probes[row]])
+            if mask is not None:
+                ids = ids[mask[ids]]
+            if len(ids) == 0:
+                continue
+            scores = (self.vectors[ids] @ query).reshape(1, -1)
+            best_scores, best = top_k_rows(scores, k)
+            top_scores[row, :best.shape[1]] = best_scores[0]
+            top_ids[row, :best.shape[1]] = ids[best[0]]
+        return top_scores, top_ids
+
+    def save(self, path, **metadata):
+        save_arrays(
+            path, kind=self.kind, vectors=self.vectors, centroids=self.centroids,
+            assignments=self.assignments, nprobe=self.nprobe, **metadata
+        )
+
+    @classmethod
+    def from_arrays(cls, data):
+        index = cls(nprobe=int(data['nprobe']))
+        index.centroids = data['centroids']
+        index.vectors = data['vectors']
+        index.assignments = data['assignments']
+        index.list_ids = [np.flatnonzero(index.assignments == list_no) for list_no in range(index.n_lists)]
+        return index
+
+
+class QuantizedIndex:
+    """Exact inner-product search over scalar-quantized vectors (int8 or float16).
+
+    Scores are computed on the codes directly: the per-dimension scales are folded
+    into the query, and codes are widened to float32 one bounded chunk at a time.
+    A saved index is memory-mapped, so processes serving the same file share it.
+    """
+
+    kind = None
+    dtype = None
+
+    def __init__(self, max_memory_mb=256):
+        self.max_memory_mb = max_memory_mb
+        self.codes = None
+        self.scales = None
+
+    def __len__(self):
+        return 0 if self.codes is None else len(self.codes)
+
+    @property
+    def vectors(self):
+        """Dequantized vectors (materialized; for reports, not for search)"""
+        return None if self.codes is None else self.codes.astype(np.float32) * self.scales
+
+    @property
+    def nbytes(self):
+        return 0 if self.codes is None else self.codes.nbytes + self.scales.nbytes
+
+    def add(self, vectors):
+        """Append vectors; int8 scales are fixed by the first batch and later values are clipped"""
+        codes, self.scales = quantize(normalize_rows(vectors), self.dtype, self.scales)
+        self.codes = codes if self.codes is None else np.vstack([self.codes, codes])
+
+    def search(self, queries, k, mask=None):
+        """Return (scores, ids) arrays of shape (n_queries, k), best first.
+
+        mask, a boolean array over the ids, restricts scoring to the rows it selects.
+        """
+        queries = normalize_rows(queries)
+        allowed = None if mask is None else np.flatnonzero(mask)
+        n_items = len(self) if allowed is None else len(allowed)
+        k = min(k, n_items)
+        if k <= 0:
+            return np.empty((len(queries), 0), dtype=np.float32), np.empty((len(queries), 0), dtype=np.int64)
+
+        scaled = queries * self.scales
+        # float32 copy of the code rows plus float32 scores and int64 partition indices per query
+        bytes_per_row = self.codes.shape[1] * 4 + len(queries) * (4 + 8)
+        chunk_rows = max(k, int(self.max_memory_mb * 1024 * 1024) // bytes_per_row)
+
+        best_scores = best_ids = None
+        for start in range(0, n_items, chunk_rows):
+            rows = slice(start, start + chunk_rows) if allowed is None else allowed[start:start + chunk_rows]
+            block = np.asarray(self.codes[rows], dtype=np.float32)
+            scores, ids = top_k_rows(scaled @ block.T, k)
+            ids = ids + start if allowed is None else rows[ids]
+            if best_scores is not None:
+                merged_scores, order = top_k_rows(np.hstack([best_scores, scores]), k)
+                ids = np.take_along_axis(np.hstack([best_ids, ids]), order, axis=1)
+                scores = merged_scores
+            best_scores, best_ids = scores, ids
+        return best_scores.astype(np.float32), best_ids
+
+    def save(self, path, **metadata):
+        save_quantized(path, self.codes, self.scales, **metadata)
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a saved index; returns (index, metadata)"""
+        codes, scales, metadata = open_quantized(path)
+        for index_type in (Int8Index, Float16Index):
+            if np.dtype(codes.dtype) == np.dtype(DTYPES[index_type.dtype]):
+                index = index_type()
+                index.codes, index.scales = codes, scales
+                return index, metadata
+        raise ValueError(f"Unsupported quantized dtype {codes.dtype}")
+
+
+class Int8Index(QuantizedIndex):
+    kind = 'int8'
+    dtype = 'int8'
+
+
+class Float16Index(QuantizedIndex):
+    kind = 'float16'
+    dtype = 'float16'
+
+
+INDEX_TYPES = {
+    BruteForceIndex.kind: BruteForceIndex, IVFIndex.kind: IVFIndex,
+    Int8Index.kind: Int8Index, Float16Index.kind: Float16Index
+}
+_INDEX_ARRAYS = {'kind', 'vectors', 'centroids', 'assignments', 'nprobe'}
+
+
+def create_index(kind='exact', **params):
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{kind}', expected one of {sorted(INDEX_TYPES)}")
+    return INDEX_TYPES[kind](**params)
+
+
+def load_index(path):
+    """Load an index saved with save(); returns (index, metadata)"""
+    if is_quantized_file(path):
+        return QuantizedIndex.open(path)
+    with np.load(path, allow_pickle=False) as data:
+        kind = str(data['kind'])
+        index = INDEX_TYPES[kind].from_arrays(data)
+        metadata = {key: data[key] for key in data.files if key not in _INDEX_ARRAYS}
+    return index, metadata
+
+
+def recall_report(index, queries, k=10, exact=None):
+    """Compare an approximate index with exact search on the same vectors.
+
+    Returns recall@k (share of the exact top-k the index also returns) and mean
+    per-query latency for both searches.
+    """
+    if exact is None:
+        exact = BruteForceIndex()
+        exact.add(index.vectors)
+    queries = normalize_rows(queries)
+
+    start = time.perf_counter()
+    _, exact_ids = exact.search(queries, k)
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    start = time.perf_counter()
+    _, approx_ids = index.search(queries, k)
+    approx_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    found = sum(len(set(a[a >= 0]) & set(e)) for a, e in zip(approx_ids, exact_ids))
+    report = {
+        'index': index.kind,
+        'k': k,
+        'queries': len(queries),
+        'recall': found / exact_ids.size if exact_ids.size else 1.0,
+        'exact_ms_per_query': exact_ms,
+        'index_ms_per_query': approx_ms
+    }
+    if isinstance(index, IVFIndex):
+        report['nprobe'] = index.nprobe
+        report['n_lists'] = index.n_lists
+    if isinstance(index, QuantizedIndex):
+        report['bytes_per_vector'] = index.nbytes / max(len(index), 1)
+        report['float32_bytes_per_vector'] = index.codes.shape[1] * 4
+    logging.info(
+        f"Recall@{k} {report['recall']:.3f} for {index.kind} index "
+        f"({approx_ms:.2f} ms/query vs {exact_ms:.2f} ms exact)"
+    )
+    return report
+
+
+def quantization_report(vectors, queries, k=10, dtypes=('float16', 'int8')):
+    """Top-k overlap with float32 exact search and memory per vector for each quantized layout"""
+    exact = BruteForceIndex()
+    exact.add(vectors)
+    reports = []
+    for dtype in dtypes:
+        index = create_index(dtype)
+        index.add(vectors)
+        report = recall_report(index, queries, k=k, exact=exact)
+        report['memory_ratio'] = report['float32_bytes_per_vector'] / report['bytes_per_vector']
+        reports.append(report)
+    return reports
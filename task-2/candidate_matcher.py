@@ -1,8 +1,32 @@
-import pandas as pd
-import numpy as np
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from pathlib import Path
+import argparse
+import heapq
 import re
+import sys
 
+# The keyword classifier is shared with the task-1 scraper
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'task-1'))
+from keyword_classifier import (
+    COMPANY_CLASSIFIER, EDUCATION_CLASSIFIER, PROFILE_CLASSIFIER, TECH_STACK_LABELS, TITLE_CLASSIFIER
+)
+from lazy_imports import LazyModule
+import instrumentation
+
+# Imported on first use so argument parsing and imports stay fast
+pd = LazyModule('pandas')
+np = LazyModule('numpy')
+
+# Probook AI required skills
+REQUIRED_SKILLS = ['Python', 'AWS', 'GCP', 'React', 'TypeScript', 'System Design']
+
+# Component order and weights of the final score (scaled to 0-10)
+SCORE_COMPONENTS = ['location', 'title', 'experience', 'skills', 'github', 'education', 'startup']
+SCORE_WEIGHTS = (0.15, 0.15, 0.20, 0.20, 0.10, 0.10, 0.10)
+
+@instrumentation.timed('ranker.load_candidates')
 def load_candidates(csv_path):
     return pd.read_csv(csv_path)
 
@@ -16,34 +40,31 @@ def calculate_location_score(location):
 
 def calculate_title_score(title, company):
     """Score based on current title relevance"""
-    title = title.lower()
-    company = company.lower()
+    title_labels = TITLE_CLASSIFIER.classify(title)
     score = 0
     
     # Base title scoring
-    if 'founding' in title:
+    if 'founding' in title_labels:
         score += 1.0
-    elif 'staff' in title:
+    elif 'staff' in title_labels:
         score += 0.9
-    elif 'senior' in title:
+    elif 'senior' in title_labels:
         score += 0.8
-    elif 'software engineer' in title:
+    elif 'software engineer' in title_labels:
         score += 0.7
         
     # Role type bonus
-    if any(x in title for x in ['ai', 'ml', 'machine learning']):
+    if 'ai/ml' in title_labels:
         score += 0.3
-    if 'full stack' in title or 'fullstack' in title:
+    if 'full stack' in title_labels:
         score += 0.2
         
     # Company size/stage bonus (prefer startup/smaller company experience)
-    startup_keywords = ['founding', 'founder', 'early']
-    if any(kw in title.lower() for kw in startup_keywords):
+    if 'startup title' in title_labels:
         score += 0.2
         
     # AI company bonus
-    ai_companies = ['waymo', 'scale', 'glean', 'openai', 'anthropic']
-    if any(co in company for co in ai_companies):
+    if 'ai company' in COMPANY_CLASSIFIER.classify(company):
         score += 0.2
         
     return min(score, 1.0)
@@ -52,20 +73,11 @@ def calculate_tech_stack_score(title, company):
     """Score based on likelihood of having Probook's required tech stack"""
     score = 0.7  # Base score
     
-    # Tech stack keywords
-    tech_stack = {
-        'aws': ['aws', 'amazon', 'cloud'],
-        'gcp': ['gcp', 'google cloud'],
-        'python': ['python', 'django', 'flask'],
-        'react': ['react', 'frontend', 'web'],
-        'typescript': ['typescript', 'javascript', 'frontend']
-    }
-    
-    text_to_search = f"{title} {company}".lower()
+    profile_labels = PROFILE_CLASSIFIER.classify(f"{title} {company}")
     
     # Score each tech stack component
-    for tech, keywords in tech_stack.items():
-        if any(kw in text_to_search for kw in keywords):
+    for tech in TECH_STACK_LABELS:
+        if tech in profile_labels:
             score += 0.06  # Up to 0.3 bonus for tech stack matches
             
     return min(score, 1.0)
@@ -76,15 +88,12 @@ def calculate_github_score(github):
 
 def calculate_education_score(education):
     """Score based on education quality"""
-    top_schools = ['stanford', 'mit', 'berkeley', 'carnegie mellon', 'princeton', 'harvard', 'yale']
-    good_schools = ['cornell', 'columbia', 'ucla', 'ucsd', 'university of michigan', 'georgia tech', 'caltech']
-    
-    education = str(education).lower()
+    education_labels = EDUCATION_CLASSIFIER.classify(str(education))
     score = 0.7  # Base score
     
-    if any(school in education for school in top_schools):
+    if 'top school' in education_labels:
         score = 1.0
-    elif any(school in education for school in good_schools):
+    elif 'good school' in education_labels:
         score = 0.9
         
     return score
@@ -94,17 +103,15 @@ def calculate_startup_score(title, company):
     score = 0.7  # Base score
     
     # Founding experience
-    if 'founding' in title.lower():
+    if 'founding' in TITLE_CLASSIFIER.classify(title):
         score += 0.3
         
     # Early-stage startup experience
-    startup_indicators = ['founding', 'founder', 'early', 'seed', 'series a']
-    if any(ind in f"{title} {company}".lower() for ind in startup_indicators):
+    if 'startup' in PROFILE_CLASSIFIER.classify(f"{title} {company}"):
         score += 0.2
         
     # Small company experience (more likely to be adaptable)
-    big_tech = ['google', 'meta', 'amazon', 'microsoft', 'apple']
-    if not any(co in company.lower() for co in big_tech):
+    if 'big tech' not in COMPANY_CLASSIFIER.classify(company):
         score += 0.1
         
     return min(score, 1.0)
@@ -123,8 +130,7 @@ def simulate_linkedin_data(title, company, education):
     prev_roles = generate_career_path(current_level, years_exp)
     
     # Simulate company sizes
-    big_companies = ['Google', 'Meta', 'Amazon', 'Microsoft', 'Apple', 'Waymo']
-    current_company_size = 'large' if any(co.lower() in company.lower() for co in big_companies) else 'startup'
+    current_company_size = 'large' if 'large company' in COMPANY_CLASSIFIER.classify(company) else 'startup'
     
     # Simulate relevant skills based on role
     skills = generate_skill_set(title, company)
@@ -138,12 +144,12 @@ def simulate_linkedin_data(title, company, education):
 
 def get_role_level(title):
     """Determine role level from title"""
-    title = title.lower()
-    if 'founding' in title or 'founder' in title:
+    title_labels = TITLE_CLASSIFIER.classify(title)
+    if 'founder level' in title_labels:
         return 4
-    elif 'staff' in title or 'principal' in title:
+    elif 'staff level' in title_labels:
         return 3
-    elif 'senior' in title or 'lead' in title:
+    elif 'senior level' in title_labels:
         return 2
     return 1
 
@@ -160,23 +166,31 @@ def generate_career_path(current_level, years_exp):
 
 def generate_skill_set(title, company):
     """Generate relevant skills based on role and company"""
+    # Role-specific skills
+    title_labels = TITLE_CLASSIFIER.classify(title)
+    
+    return skill_set_from_flags(
+        'frontend skills' in title_labels,
+        'backend skills' in title_labels,
+        'ai skills' in title_labels or 'ml company' in COMPANY_CLASSIFIER.classify(company),
+        'founding' in title_labels
+    )
+
+def skill_set_from_flags(frontend, backend, ai, founding):
+    """Skill list for a combination of role flags (shared by the per-row and column-wise paths)"""
     skills = set()
     
     # Base skills
     base_skills = {'Git', 'CI/CD', 'System Design'}
     skills.update(base_skills)
     
-    # Role-specific skills
-    title = title.lower()
-    company = company.lower()
-    
-    if 'frontend' in title or 'full stack' in title:
+    if frontend:
         skills.update({'React', 'TypeScript', 'JavaScript', 'HTML/CSS'})
-    if 'backend' in title or 'full stack' in title:
+    if backend:
         skills.update({'Python', 'AWS', 'GCP', 'Databases'})
-    if 'ai' in title or 'ml' in title or any(co in company for co in ['waymo', 'scale', 'openai']):
+    if ai:
         skills.update({'Machine Learning', 'PyTorch', 'TensorFlow'})
-    if 'founding' in title:
+    if founding:
         skills.update({'Architecture', 'Team Leadership', 'Product Strategy'})
         
     return list(skills)
@@ -206,10 +220,11 @@ def calculate_skills_match(simulated_data, required_skills):
     match_score = len(skills.intersection(required)) / len(required)
     return min(0.7 + match_score * 0.3, 1.0)
 
+@instrumentation.timed('ranker.rank_candidates')
 def rank_candidates(df):
     """Calculate final scores and rank candidates"""
-    # Probook AI required skills
-    required_skills = ['Python', 'AWS', 'GCP', 'React', 'TypeScript', 'System Design']
+    instrumentation.count('ranker.candidates_scored', len(df))
+    required_skills = REQUIRED_SKILLS
     
     scores = []
     for _, row in df.iterrows():
@@ -263,6 +278,224 @@ def rank_candidates(df):
     
     return sorted(scores, key=lambda x: x['Score'], reverse=True)
 
+def _contains_any(series, keywords):
+    """Column-wise `any(kw in text for kw in keywords)`"""
+    mask = np.zeros(len(series), dtype=bool)
+    for kw in keywords:
+        mask |= series.str.contains(kw, regex=False).to_numpy(dtype=bool)
+    return mask
+
+def _label_masks(classifier, series):
+    """One boolean column per classifier label, classifying each distinct value once"""
+    labels_by_value = {value: classifier.classify(value) for value in pd.unique(series)}
+    found = series.map(labels_by_value)
+    return {
+        label: np.fromiter((label in labels for labels in found), dtype=bool, count=len(found))
+        for label in classifier.labels
+    }
+
+@instrumentation.timed('ranker.score')
+def score_candidates(df):
+    """Column-wise equivalent of the per-row scoring in rank_candidates.
+
+    Returns the (n, 7) component matrix in SCORE_COMPONENTS order, years of
+    experience, the 'Skills' column text, and the final score before and after
+    rounding; every value equals what the calculate_* functions give per row.
+    """
+    instrumentation.count('ranker.candidates_scored', len(df))
+    title = df['Current Title'].fillna('').reset_index(drop=True)
+    company = df['Current Org Name'].fillna('').reset_index(drop=True)
+    location = df['Location'].fillna('').reset_index(drop=True)
+    github = df['GitHub'].reset_index(drop=True)
+    education = df['Education'].map(str).reset_index(drop=True)
+    title_is = _label_masks(TITLE_CLASSIFIER, title)
+    company_is = _label_masks(COMPANY_CLASSIFIER, company)
+    profile_is = _label_masks(PROFILE_CLASSIFIER, title + ' ' + company)
+    education_is = _label_masks(EDUCATION_CLASSIFIER, education)
+
+    # Location
+    location_score = np.where(
+        _contains_any(location, ['New York']), 1.0,
+        np.where(_contains_any(location, ['California', 'New Jersey']), 0.8, 0.6)
+    )
+
+    # Title: additions happen in the same order as calculate_title_score
+    title_score = np.select(
+        [title_is['founding'], title_is['staff'], title_is['senior'], title_is['software engineer']],
+        [1.0, 0.9, 0.8, 0.7], 0.0
+    )
+    title_score = title_score + np.where(title_is['ai/ml'], 0.3, 0.0)
+    title_score = title_score + np.where(title_is['full stack'], 0.2, 0.0)
+    title_score = title_score + np.where(title_is['startup title'], 0.2, 0.0)
+    title_score = title_score + np.where(company_is['ai company'], 0.2, 0.0)
+    title_score = np.minimum(title_score, 1.0)
+
+    # Simulated years of experience from the earliest year in the education field
+    years_found = education.str.extractall(r'(\d{4})')[0].map(int).groupby(level=0).min()
+    grad_year = years_found.reindex(range(len(df))).fillna(2020).to_numpy(dtype=np.int64)
+    years_exp = datetime.now().year - grad_year
+
+    # Previous roles: len(roles[:min(len(roles), years_exp // 2)]) including negative slices
+    role_level = np.select(
+        [title_is['founder level'], title_is['staff level'], title_is['senior level']],
+        [4, 3, 2], 1
+    )
+    path_length = np.select([role_level >= 3, role_level == 2], [2, 1], 0)
+    cut = np.minimum(path_length, years_exp // 2)
+    previous_roles = np.where(cut >= 0, cut, np.maximum(path_length + cut, 0))
+
+    experience_score = 0.7 + np.select([years_exp >= 5, years_exp >= 3], [0.2, 0.1], 0.0)
+    experience_score = experience_score + np.where(previous_roles >= 2, 0.1, 0.0)
+    experience_score = np.minimum(experience_score, 1.0)
+
+    # Skills depend only on four role flags, so score each of the 16 combinations once
+    flags = np.column_stack([
+        title_is['frontend skills'],
+        title_is['backend skills'],
+        title_is['ai skills'] | company_is['ml company'],
+        title_is['founding']
+    ])
+    combo = flags @ np.array([8, 4, 2, 1])
+    combo_skills = [
+        skill_set_from_flags(*(bool(code & bit) for bit in (8, 4, 2, 1))) for code in range(16)
+    ]
+    combo_scores = np.array([
+        calculate_skills_match({'skills': skills}, REQUIRED_SKILLS) for skills in combo_skills
+    ])
+    skills_score = combo_scores[combo]
+    skills_text = np.array([', '.join(skills[:5]) for skills in combo_skills], dtype=object)[combo]
+
+    # GitHub presence: a non-empty string
+    is_str = github.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    github_score = np.where(is_str & (github.where(is_str, '').astype(str).str.len() > 0), 1.0, 0.0)
+
+    education_score = np.where(
+        education_is['top school'], 1.0, np.where(education_is['good school'], 0.9, 0.7)
+    )
+
+    startup_score = 0.7 + np.where(title_is['founding'], 0.3, 0.0)
+    startup_score = startup_score + np.where(profile_is['startup'], 0.2, 0.0)
+    startup_score = startup_score + np.where(company_is['big tech'], 0.0, 0.1)
+    startup_score = np.minimum(startup_score, 1.0)
+
+    components = np.column_stack([
+        location_score, title_score, experience_score, skills_score,
+        github_score, education_score, startup_score
+    ])
+    final = _weighted_sum(components, SCORE_WEIGHTS) * 10
+    return {
+        'components': components,
+        'years_experience': years_exp,
+        'skills': skills_text,
+        'final': final,
+        'score': np.array([round(value, 1) for value in final.tolist()])
+    }
+
+def _weighted_sum(components, weights):
+    """components @ weights, accumulated column by column in the same order as the
+    per-row formula so the rounded scores match it exactly (a BLAS dot may reorder
+    the additions and flip a score sitting on a rounding boundary)"""
+    total = components[:, 0] * weights[0]
+    for i in range(1, len(weights)):
+        total = total + components[:, i] * weights[i]
+    return total
+
+def top_k_stable(scores, k=None):
+    """Positions of the k highest scores, ordered like a stable descending sort"""
+    if k is None or k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    threshold = scores[np.argpartition(-scores, k - 1)[:k]].min()
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+    selected = np.concatenate([above, ties])
+    return selected[np.argsort(-scores[selected], kind='stable')]
+
+@instrumentation.timed('ranker.rank_candidates')
+def rank_candidates_vectorized(df, top_k=None):
+    """Column-wise rank_candidates; returns the same dicts as rank_candidates(df)[:top_k]"""
+    scored = score_candidates(df)
+    results = []
+    for pos in top_k_stable(scored['score'], top_k):
+        results.append(build_candidate_result(df.iloc[pos], scored, pos))
+    return results
+
+@instrumentation.timed('ranker.build_result')
+def build_candidate_result(row, scored, pos):
+    """Result dict for one candidate from the column-wise scores"""
+    location_score, title_score, experience_score, skills_score, github_score, \
+        education_score, startup_score = scored['components'][pos].tolist()
+    years_experience = int(scored['years_experience'][pos])
+    return {
+        'Name': f"{row['First name']} {row['Last name']}",
+        'LinkedIn': row['LinkedIn'],
+        'Score': float(scored['score'][pos]),
+        'Current Role': f"{row['Current Title']} @ {row['Current Org Name']}",
+        'Location': row['Location'],
+        'Years Experience': years_experience,
+        'Skills': scored['skills'][pos],
+        'Why': generate_justification(
+            row,
+            location_score,
+            title_score,
+            experience_score,
+            skills_score,
+            github_score,
+            education_score,
+            startup_score,
+            {'years_experience': years_experience}
+        )
+    }
+
+def _score_chunk(chunk, offset, top_n):
+    """Score one CSV chunk and return its top_n as (score, file position, result)"""
+    scored = score_candidates(chunk)
+    return [
+        (float(scored['score'][pos]), offset + int(pos), build_candidate_result(chunk.iloc[pos], scored, pos))
+        for pos in top_k_stable(scored['score'], top_n)
+    ]
+
+@instrumentation.timed('ranker.rank_candidates')
+def rank_candidates_streaming(csv_path, top_n=10, chunksize=50000, workers=1):
+    """Rank a candidate CSV of any size while holding only one chunk per worker plus top_n results.
+
+    Returns the same list as rank_candidates(load_candidates(csv_path))[:top_n]. With
+    workers > 1 the chunks are scored in other processes, so only this process's
+    spans and counters (reading, merging) are recorded.
+    """
+    # Min-heap of (score, -file position, result): the root is the weakest candidate kept,
+    # and on equal scores the later row is the weaker one, matching the stable sort
+    heap = []
+
+    def keep(chunk_results):
+        for score, position, result in chunk_results:
+            entry = (score, -position, result)
+            if len(heap) < top_n:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+
+    chunks = pd.read_csv(csv_path, chunksize=chunksize)
+    offset = 0
+    if workers <= 1:
+        for chunk in chunks:
+            keep(_score_chunk(chunk, offset, top_n))
+            offset += len(chunk)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Bound the chunks in flight so reading never runs far ahead of scoring
+            in_flight = deque()
+            for chunk in chunks:
+                in_flight.append(executor.submit(_score_chunk, chunk, offset, top_n))
+                offset += len(chunk)
+                if len(in_flight) >= workers * 2:
+                    keep(in_flight.popleft().result())
+            while in_flight:
+                keep(in_flight.popleft().result())
+
+    return [result for _, _, result in sorted(heap, key=lambda entry: (-entry[0], -entry[1]))]
+
 def generate_justification(row, location_score, title_score, experience_score, 
                          skills_score, github_score, education_score, 
                          startup_score, simulated_data):
@@ -305,9 +538,29 @@ def format_linkedin_message(candidate):
     exp_years = f"{candidate['Years Experience']}+"
     return f"Hi {candidate['Name'].split()[0]}, I'm reaching out about a Founding Engineer role at Probook AI. Given your {exp_years} years of experience at {company} and background in {candidate['Skills'].split(',')[0]}, I'd love to chat."
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rank Juicebox candidates for the Probook AI role")
+    parser.add_argument('--csv', default='JuiceboxExport_1743820890826.csv', help="Candidate CSV export")
+    parser.add_argument('--stream', action='store_true',
+                        help="Read the CSV in chunks and keep only the running top candidates")
+    parser.add_argument('--chunksize', type=int, default=50000, help="Rows per chunk in streaming mode")
+    parser.add_argument('--workers', type=int, default=1, help="Processes scoring chunks in streaming mode")
+    instrumentation.add_arguments(parser)
+    return parser.parse_args()
+
 def main():
-    df = load_candidates('e:/resume_shortlister/task-2/JuiceboxExport_1743820890826.csv')
-    top_candidates = rank_candidates(df)[:10]
+    args = parse_args()
+    with instrumentation.from_args(args):
+        run(args)
+
+def run(args):
+    if args.stream:
+        top_candidates = rank_candidates_streaming(
+            args.csv, top_n=10, chunksize=args.chunksize, workers=args.workers
+        )
+    else:
+        df = load_candidates(args.csv)
+        top_candidates = rank_candidates_vectorized(df, top_k=10)
     
     print("\nTop Candidates for Probook AI Founding Engineer Role:")
     print("=" * 80)